@@ -118,6 +118,7 @@ from .settings import (
     HOP_REDISCOVER_INTERVAL,
     HOP_LATENCY_GOOD,
     HOP_LATENCY_WARN,
+    HOP_SPARKLINE_POINTS,
 )
 
 # Problem analysis
@@ -307,6 +308,7 @@ __all__ = [
     "HOP_REDISCOVER_INTERVAL",
     "HOP_LATENCY_GOOD",
     "HOP_LATENCY_WARN",
+    "HOP_SPARKLINE_POINTS",
     # Problem analysis
     "ENABLE_PROBLEM_ANALYSIS",
     "PROBLEM_ANALYSIS_INTERVAL",
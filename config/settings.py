@@ -166,6 +166,8 @@ HOP_PING_TIMEOUT = settings.HOP_PING_TIMEOUT
 HOP_REDISCOVER_INTERVAL = settings.HOP_REDISCOVER_INTERVAL
 HOP_LATENCY_GOOD = settings.HOP_LATENCY_GOOD
 HOP_LATENCY_WARN = settings.HOP_LATENCY_WARN
+# Latency samples per hop shown by the UI trend sparkline; not user-configurable.
+HOP_SPARKLINE_POINTS = 8
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Problem Analysis
@@ -5,7 +5,7 @@ Contains TypedDict classes for statistics and factory functions to create instan
 """
 
 from collections import deque
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Deque, Dict, TypedDict
 
 from .settings import LATENCY_WINDOW, WINDOW_SIZE
@@ -21,7 +21,6 @@ def ensure_utc(dt: datetime | None) -> datetime | None:
     if dt is None:
         return None
     if dt.tzinfo is None:
-        from datetime import timezone
         return dt.replace(tzinfo=timezone.utc)
     return dt
 
@@ -84,6 +83,7 @@ class StatsDict(TypedDict):
     problem_pattern: str
     problem_history: list[Dict[str, Any]]
     route_hops: list[Dict[str, Any]]
+    route_avg_latency: float | None
     route_problematic_hop: int | None
     route_changed: bool
     route_consecutive_changes: int
@@ -167,6 +167,7 @@ def create_stats() -> StatsDict:
         "problem_pattern": "...",
         "problem_history": [],
         "route_hops": [],
+        "route_avg_latency": None,
         "route_problematic_hop": None,
         "route_changed": False,
         "route_consecutive_changes": 0,
@@ -167,12 +167,7 @@ class AlertHandler:
             )
             
             # Get loss percentage from recent results
-            with self.stats_repo.lock:
-                recent = self.stats_repo.get_recent_results()
-                if recent:
-                    loss_pct = (recent.count(False) / len(recent)) * 100
-                else:
-                    loss_pct = 0.0
+            loss_pct = self.stats_repo.get_recent_loss_pct()
             
             should_trigger, alert = self.smart_alert_manager.should_trigger_alert(
                 metric="packet_loss",
@@ -54,10 +54,7 @@ class MetricsHandler:
                 PING_FAILURE.inc()
             
             # Update packet loss gauge
-            snap = self.stats_repo.get_snapshot()
-            if snap.get("recent_results"):
-                loss_pct = snap["recent_results"].count(False) / len(snap["recent_results"]) * 100
-                PACKET_LOSS_GAUGE.set(loss_pct)
+            PACKET_LOSS_GAUGE.set(self.stats_repo.get_recent_loss_pct())
         except Exception:
             # Silently ignore metrics errors
             pass
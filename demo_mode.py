@@ -42,6 +42,7 @@ from rich.console import Console
 from rich.live import Live
 
 from config import t
+from stats_repository import build_hop_columns, mean_hop_latency, median_p95_sorted
 from ui import MonitorUI
 from ui_protocols.protocols import StatsDataProvider
 
@@ -248,6 +249,7 @@ class FakeStatsProvider(StatsDataProvider):
             max_lat = 0.0
             sum_lat = 0.0
 
+        latency_median, latency_p95 = median_p95_sorted(sorted(self._latencies))
         current_lat = self._latencies[-1] if self._latencies else 0
         jitter = self._jitter_history[-1] if self._jitter_history else 0.0
 
@@ -256,12 +258,19 @@ class FakeStatsProvider(StatsDataProvider):
         total_fail = total_sent - total_success
 
         last_latency_ms = f"{current_lat:.1f}" if current_lat > 0 else t("na")
+        hops = self._get_hops()
 
         return {
+            # The scenario data is static, so every snapshot is the same version.
+            "version": 0,
+
             # ── Counters ──
             "total": total_sent,
             "success": total_success,
             "failure": total_fail,
+            "success_rate": total_success / total_sent * 100 if total_sent else 0.0,
+            "loss_total_pct": total_fail / total_sent * 100 if total_sent else 0.0,
+            "loss_recent_pct": total_fail / total_sent * 100 if total_sent else 0.0,
 
             # ── Last ping ──
             "last_status": t("status_ok") if current_lat > 0 else t("status_timeout"),
@@ -272,6 +281,8 @@ class FakeStatsProvider(StatsDataProvider):
             "max_latency": max_lat,
             "total_latency_sum": sum_lat,
             "latencies": list(self._latencies),
+            "latency_median": latency_median,
+            "latency_p95": latency_p95,
             "jitter_history": list(self._jitter_history),
 
             # ── Losses ──
@@ -310,6 +321,7 @@ class FakeStatsProvider(StatsDataProvider):
             "dns_status": t("ok"),
             "dns_results": {},
             "dns_benchmark": self.dns_benchmark.get_stats(),
+            "dns_health": {},
 
             # ── Traceroute ──
             "last_traceroute_time": (
@@ -347,7 +359,8 @@ class FakeStatsProvider(StatsDataProvider):
             ),
 
             # ── Route ──
-            "route_hops": self._get_hops(),
+            "route_hops": hops,
+            "route_avg_latency": mean_hop_latency(hops),
             "route_problematic_hop": 3 if self.scenario == "problems" else None,
             "route_changed": self._route_changed,
             "route_consecutive_changes": 1 if self._route_changed else 0,
@@ -361,9 +374,11 @@ class FakeStatsProvider(StatsDataProvider):
             # ── Alerts ──
             "active_alerts": list(self._active_alerts),
             "recent_results": list(self._recent_results),
+            "threshold_warmup": {},
 
             # ── Hop monitor ──
-            "hop_monitor_hops": self._get_hops(),
+            "hop_monitor_hops": hops,
+            "hop_monitor_columns": build_hop_columns(hops),
             "hop_monitor_discovering": False,
 
             # ── Version ──
@@ -390,10 +405,10 @@ def run_demo(scenario: str = "normal", refresh_rate: float = 1.0):
     console.print("Press Ctrl+C to exit\n")
 
     try:
-        with Live(console=console, refresh_per_second=1 / refresh_rate) as live:
+        with Live(console=console, auto_refresh=False) as live:
             while True:
                 layout = ui.generate_layout()
-                live.update(layout)
+                live.update(layout, refresh=True)
                 time.sleep(refresh_rate)
     except KeyboardInterrupt:
         console.print("\n[yellow]Demo stopped.[/yellow]")
@@ -125,16 +125,20 @@ class PingerApp:
         tasks = self.monitor.start_tasks()
 
         try:
+            # The loop below redraws once per ping; a background auto-refresh would only
+            # repaint the same frame a second time.
             with Live(
                 self.ui.generate_layout(),
-                refresh_per_second=1,
+                console=self.console,
+                auto_refresh=False,
                 screen=True,
                 transient=False,
             ) as live:
                 while not self.monitor.stop_event.is_set():
                     await self.monitor.ping_once()
                     self.monitor.check_thresholds()
-                    live.update(self.ui.generate_layout())
+                    # Not forced: a frame whose snapshot version is unchanged is reused.
+                    live.update(self.ui.generate_layout(), refresh=True)
                     await asyncio.sleep(INTERVAL)
         except Exception as exc:  # pragma: no cover - runtime logging
             logging.error(f"Main loop error: {exc}")
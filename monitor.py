@@ -6,6 +6,7 @@ import os
 import subprocess
 import sys
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
@@ -79,6 +80,10 @@ from infrastructure import (
     get_process_manager,
 )
 
+# Minimum seconds between sweeps of expired visual alerts. Alerts are shown for
+# ALERT_DISPLAY_TIME seconds, so a sweep per ping is far finer than needed.
+ALERT_CLEANUP_INTERVAL = 1.0
+
 
 class Monitor:
     """
@@ -106,6 +111,7 @@ class Monitor:
         self._ping_counter = 0
         self._memory_check_interval = 10
         self._ping_lock = threading.Lock()
+        self._next_alert_cleanup = 0.0
         
         # Data repository
         self.stats_repo = StatsRepository()
@@ -394,8 +400,11 @@ class Monitor:
             warmup_status = self.smart_alert_manager.adaptive_thresholds.get_warmup_status()
             self.stats_repo.update_threshold_warmup(warmup_status)
         
-        # 5. Clean up old visual alerts
-        self.cleanup_alerts()
+        # 5. Clean up old visual alerts (at most once per ALERT_CLEANUP_INTERVAL)
+        now = time.monotonic()
+        if now >= self._next_alert_cleanup:
+            self._next_alert_cleanup = now + ALERT_CLEANUP_INTERVAL
+            self.cleanup_alerts()
         
         # 6. Periodic maintenance (every N pings)
         with self._ping_lock:
@@ -460,13 +469,7 @@ class Monitor:
         snap = self.get_stats_snapshot()
         
         # Packet loss threshold
-        loss30 = (
-            snap["recent_results"].count(False) / len(snap["recent_results"]) * 100
-            if snap["recent_results"]
-            else 0.0
-        )
-        
-        self._check_packet_loss_threshold(loss30, snap)
+        self._check_packet_loss_threshold(snap["loss_recent_pct"], snap)
         self._check_avg_latency_threshold(snap)
         self._check_connection_lost_threshold(snap)
         self._check_jitter_threshold(snap)
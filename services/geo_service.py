@@ -10,6 +10,7 @@ For enhanced security, consider using a VPN or a paid geolocation service.
 from __future__ import annotations
 
 import logging
+import re
 import time
 from collections import OrderedDict
 from dataclasses import dataclass
@@ -20,6 +21,14 @@ import requests.exceptions
 
 logger = logging.getLogger(__name__)
 
+# Leading "AS" of an AS number such as "AS15169 Google LLC".
+_ASN_PREFIX_RE = re.compile(r"^\s*AS(?=\d)", re.IGNORECASE)
+
+
+def _clean_asn(raw: object) -> str:
+    """Return *raw* without its leading ``AS``, keeping the organization name intact."""
+    return _ASN_PREFIX_RE.sub("", str(raw or ""), count=1).strip()
+
 
 @dataclass
 class GeoInfo:
@@ -99,7 +108,7 @@ class GeoService:
             country=data.get("country", "?"),
             country_code=data.get("countryCode", ""),
             city=data.get("city", ""),
-            asn=data.get("as", "").replace("AS", ""),  # Remove "AS" prefix
+            asn=_clean_asn(data.get("as")),
             org=data.get("org", ""),
         )
 
@@ -126,7 +135,7 @@ class GeoService:
             country=data.get(provider["country_key"], "?"),
             country_code=data.get(provider["country_code_key"], ""),
             city=data.get(provider["city_key"], ""),
-            asn=str(data.get(provider["asn_key"], "")).replace("AS", ""),
+            asn=_clean_asn(data.get(provider["asn_key"])),
             org=data.get(provider["org_key"], ""),
         )
 
@@ -11,6 +11,7 @@ import threading
 import time
 import asyncio
 from collections import deque
+from itertools import islice
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -20,6 +21,7 @@ from config import (
     TARGET_IP,
     TRACEROUTE_MAX_HOPS,
     HOP_PING_TIMEOUT,
+    HOP_SPARKLINE_POINTS,
     t,
 )
 
@@ -56,6 +58,8 @@ class HopStatus:
         return (self.loss_count / self.total_pings * 100) if self.total_pings else 0.0
 
     def to_dict(self) -> Dict[str, Any]:
+        history = list(islice(self.latency_history, max(0, len(self.latency_history) - HOP_SPARKLINE_POINTS), None))
+        positive = [v for v in history if v > 0]
         return {
             "hop": self.hop_number,
             "ip": self.ip,
@@ -70,8 +74,9 @@ class HopStatus:
             # new fields
             "jitter": self.jitter,
             "latency_delta": self.latency_delta,
-            # for sparkline rendering - last 10 values
-            "latency_history": list(self.latency_history)[-10:] if self.latency_history else [],
+            # for sparkline rendering - last values and their (min, max) scale
+            "latency_history": history,
+            "latency_range": (min(positive), max(positive)) if positive else None,
             # geolocation fields
             "country": self.country,
             "country_code": self.country_code,
@@ -4,10 +4,11 @@ from __future__ import annotations
 import logging
 import threading
 import statistics
+from bisect import bisect_left, insort
 from collections import deque
 from datetime import datetime, timezone
 
-from typing import Any, Dict, TypedDict, Optional
+from typing import Any, Dict, Optional, Sequence, TypedDict
 
 from config import (
     create_stats,
@@ -20,17 +21,90 @@ from config import (
 )
 
 
+class HopColumns(TypedDict):
+    """Hop monitor fields transposed into parallel tuples, one entry per hop."""
+    hop: tuple[Any, ...]
+    last_latency: tuple[float | None, ...]
+    avg_latency: tuple[float | None, ...]
+    min_latency: tuple[float | None, ...]
+    loss_pct: tuple[float, ...]
+    jitter: tuple[float, ...]
+    latency_delta: tuple[float, ...]
+    last_ok: tuple[bool, ...]
+    hostname: tuple[str, ...]
+    ip: tuple[str, ...]
+    country_code: tuple[str, ...]
+    asn: tuple[str, ...]
+    latency_history: tuple[tuple[float, ...], ...]
+    latency_range: tuple[tuple[float, float] | None, ...]
+
+
+def build_hop_columns(hops: list[dict[str, Any]]) -> HopColumns:
+    """Normalize *hops* once into columns so the UI reads each row as one tuple."""
+    return {
+        "hop": tuple(hop.get("hop", "?") for hop in hops),
+        "last_latency": tuple(hop.get("last_latency") for hop in hops),
+        "avg_latency": tuple(hop.get("avg_latency") for hop in hops),
+        "min_latency": tuple(hop.get("min_latency") for hop in hops),
+        "loss_pct": tuple(float(hop.get("loss_pct", 0.0) or 0.0) for hop in hops),
+        "jitter": tuple(float(hop.get("jitter", 0.0) or 0.0) for hop in hops),
+        "latency_delta": tuple(float(hop.get("latency_delta", 0.0) or 0.0) for hop in hops),
+        "last_ok": tuple(bool(hop.get("last_ok", True)) for hop in hops),
+        "hostname": tuple(hop.get("hostname") or hop.get("ip", "?") for hop in hops),
+        "ip": tuple(hop.get("ip", "?") for hop in hops),
+        "country_code": tuple(hop.get("country_code", "") for hop in hops),
+        "asn": tuple(hop.get("asn", "") for hop in hops),
+        "latency_history": tuple(
+            tuple(float(v) for v in hop.get("latency_history") or () if v is not None) for hop in hops
+        ),
+        "latency_range": tuple(hop.get("latency_range") for hop in hops),
+    }
+
+
+def mean_hop_latency(hops: list[dict[str, Any]]) -> float | None:
+    """Return the mean ``avg_latency`` over *hops* that report one, or ``None``."""
+    latencies = [lat for hop in hops if (lat := hop.get("avg_latency")) is not None]
+    return sum(latencies) / len(latencies) if latencies else None
+
+
+def median_p95_sorted(ordered: Sequence[float]) -> tuple[float | None, float | None]:
+    """Return ``(median, p95)`` of already sorted *ordered*, or ``None`` for each when empty.
+
+    Results match ``statistics.median`` and ``statistics.quantiles(n=20)[18]``
+    ("exclusive" method); with fewer than 20 samples the maximum stands in for
+    the 95th percentile.
+    """
+    count = len(ordered)
+    if not count:
+        return None, None
+    mid = count // 2
+    med = ordered[mid] if count % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    if count < 20:
+        return med, ordered[-1]
+    m = count + 1
+    j = min(max(19 * m // 20, 1), count - 1)
+    delta = 19 * m - j * 20
+    p95 = (ordered[j - 1] * (20 - delta) + ordered[j] * delta) / 20
+    return med, p95
+
+
 class StatsSnapshot(TypedDict):
     """Immutable snapshot of monitoring stats for UI."""
+    version: int  # changes whenever any other field may have changed
     total: int
     success: int
     failure: int
+    success_rate: float  # percent of all pings that succeeded
+    loss_total_pct: float  # percent of all pings lost
+    loss_recent_pct: float  # percent lost over the recent results window
     last_status: str
     last_latency_ms: str
     min_latency: float
     max_latency: float
     total_latency_sum: float
     latencies: list[float]
+    latency_median: float | None  # median of latencies
+    latency_p95: float | None  # 95th percentile of latencies
     jitter_history: list[float]
     consecutive_losses: int
     max_consecutive_losses: int
@@ -62,6 +136,7 @@ class StatsSnapshot(TypedDict):
     problem_prediction: str
     problem_pattern: str
     route_hops: list[dict[str, Any]]
+    route_avg_latency: float | None  # mean of the hops' avg_latency
     route_problematic_hop: int | None
     route_changed: bool
     route_consecutive_changes: int
@@ -72,6 +147,7 @@ class StatsSnapshot(TypedDict):
     recent_results: list[bool]  # copy of recent results for UI
     threshold_warmup: Dict[str, Dict[str, int]]
     hop_monitor_hops: list[dict[str, Any]]
+    hop_monitor_columns: HopColumns  # the same hops, column-wise
     hop_monitor_discovering: bool
     latest_version: str | None
     version_check_time: datetime | None
@@ -91,13 +167,20 @@ class StatsRepository:
     def __init__(self) -> None:
         self._stats: StatsDict = create_stats()
         self._recent_results: deque[bool] = deque(maxlen=WINDOW_SIZE)
+        self._recent_failures = 0  # number of False entries in _recent_results
         self._stats["latencies"] = deque(maxlen=LATENCY_WINDOW)
+        self._sorted_latencies: list[float] = []  # the latencies window, kept sorted
+        # (ping total, latencies copy, jitter copy) shared by snapshots until the next ping
+        self._history_copies: tuple[int, list[float], list[float]] | None = None
         self._stats["jitter_history"] = deque(maxlen=LATENCY_WINDOW)
         self._stats["threshold_warmup"] = {}
         self._stats["latest_version"] = None
         self._stats["version_check_time"] = None
         self._stats["version_up_to_date"] = False
         self._system_traffic_baseline: tuple[int, int] | None = None
+        self._hop_columns: HopColumns = build_hop_columns([])
+        # Bumped by every change a snapshot can show; equal versions mean equal snapshots.
+        self._version = 0
         self._lock = threading.RLock()
 
     @property
@@ -110,23 +193,50 @@ class StatsRepository:
         return self._stats
 
     def get_recent_results(self) -> deque[bool]:
-        """Get recent results deque. Use with lock!"""
+        """Get recent results deque. Use with lock! Record results via update_after_ping only."""
         return self._recent_results
 
+    def _recent_loss_pct(self) -> float:
+        """Loss percentage over the recent window, from the running failure count. Call with lock held."""
+        count = len(self._recent_results)
+        return self._recent_failures / count * 100 if count else 0.0
+
+    def get_recent_loss_pct(self) -> float:
+        """Get packet loss percentage over the recent results window."""
+        with self._lock:
+            return self._recent_loss_pct()
+
     def get_snapshot(self) -> StatsSnapshot:
         """Get immutable snapshot for UI."""
         with self._lock:
+            total = self._stats["total"]
+            recent = self._recent_results
+            latency_median, latency_p95 = median_p95_sorted(self._sorted_latencies)
+            # The histories only change when a ping is recorded, so frames between
+            # pings share one read-only copy instead of copying the window each time.
+            history = self._history_copies
+            if history is None or history[0] != total:
+                history = (
+                    total, list(self._stats["latencies"]), list(self._stats.get("jitter_history", [])),
+                )
+                self._history_copies = history
             return {
-                "total": self._stats["total"],
+                "version": self._version,
+                "total": total,
                 "success": self._stats["success"],
                 "failure": self._stats["failure"],
+                "success_rate": self._stats["success"] / total * 100 if total else 0.0,
+                "loss_total_pct": self._stats["failure"] / total * 100 if total else 0.0,
+                "loss_recent_pct": self._recent_loss_pct(),
                 "last_status": self._stats["last_status"],
                 "last_latency_ms": self._stats["last_latency_ms"],
                 "min_latency": self._stats["min_latency"],
                 "max_latency": self._stats["max_latency"],
                 "total_latency_sum": self._stats["total_latency_sum"],
-                "latencies": list(self._stats["latencies"]),
-                "jitter_history": list(self._stats.get("jitter_history", [])),
+                "latencies": history[1],
+                "latency_median": latency_median,
+                "latency_p95": latency_p95,
+                "jitter_history": history[2],
                 "consecutive_losses": self._stats["consecutive_losses"],
                 "max_consecutive_losses": self._stats["max_consecutive_losses"],
                 "public_ip": self._stats["public_ip"],
@@ -162,6 +272,7 @@ class StatsRepository:
                 "problem_prediction": self._stats["problem_prediction"],
                 "problem_pattern": self._stats["problem_pattern"],
                 "route_hops": list(self._stats.get("route_hops", [])),
+                "route_avg_latency": self._stats["route_avg_latency"],
                 "route_problematic_hop": self._stats.get("route_problematic_hop"),
                 "route_changed": self._stats.get("route_changed", False),
                 "route_consecutive_changes": self._stats.get("route_consecutive_changes", 0),
@@ -169,9 +280,10 @@ class StatsRepository:
                 "route_last_change_time": self._stats.get("route_last_change_time"),
                 "route_last_diff_count": self._stats.get("route_last_diff_count", 0),
                 "active_alerts": list(self._stats.get("active_alerts", [])),
-                "recent_results": list(self._recent_results),
-                "threshold_warmup": dict(self._stats.get("threshold_warmup", {})),
+                "recent_results": list(recent),
+                "threshold_warmup": self._stats.get("threshold_warmup", {}),
                 "hop_monitor_hops": list(self._stats.get("hop_monitor_hops", [])),
+                "hop_monitor_columns": self._hop_columns,
                 "hop_monitor_discovering": self._stats.get("hop_monitor_discovering", False),
                 "latest_version": self._stats.get("latest_version"),
                 "version_check_time": self._stats.get("version_check_time"),
@@ -198,6 +310,7 @@ class StatsRepository:
         loss_flag = False
 
         with self._lock:
+            self._version += 1
             self._stats["total"] += 1
             
             if ok:
@@ -208,7 +321,11 @@ class StatsRepository:
                 if latency is not None:
                     self._stats["last_latency_ms"] = f"{latency:.2f}"
                     self._stats["total_latency_sum"] += latency
-                    self._stats["latencies"].append(latency)
+                    latencies = self._stats["latencies"]
+                    if len(latencies) == latencies.maxlen:
+                        del self._sorted_latencies[bisect_left(self._sorted_latencies, latencies[0])]
+                    latencies.append(latency)
+                    insort(self._sorted_latencies, latency)
                     self._stats["min_latency"] = min(self._stats["min_latency"], latency)
                     self._stats["max_latency"] = max(self._stats["max_latency"], latency)
                     
@@ -243,19 +360,27 @@ class StatsRepository:
                 if alert_on_packet_loss:
                     loss_flag = True
             
-            # Add to recent results (thread-safe via lock)
-            self._recent_results.append(ok)
+            # Add to recent results (thread-safe via lock), keeping the failure count
+            # in step with the entry the full window evicts.
+            recent = self._recent_results
+            if len(recent) == recent.maxlen and not recent[0]:
+                self._recent_failures -= 1
+            recent.append(ok)
+            if not ok:
+                self._recent_failures += 1
 
         return high_latency_flag, loss_flag
 
     def set_start_time(self, time: datetime) -> None:
         """Set monitoring start time."""
         with self._lock:
+            self._version += 1
             self._stats["start_time"] = time
 
     def update_dns(self, resolve_time: float | None, status: str) -> None:
         """Update DNS status (legacy - for backward compatibility)."""
         with self._lock:
+            self._version += 1
             self._stats["dns_resolve_time"] = resolve_time
             self._stats["dns_status"] = status
 
@@ -277,6 +402,7 @@ class StatsRepository:
             return
             
         with self._lock:
+            self._version += 1
             # Store detailed results by record type
             try:
                 self._stats["dns_results"] = {
@@ -295,21 +421,26 @@ class StatsRepository:
                 logging.warning(f"Invalid DNS results format: {exc}")
                 return
             
-            # Calculate overall status
-            successful = [r for r in dns_results if r["success"]]
-            if not dns_results:
-                self._stats["dns_status"] = t("failed")
-                self._stats["dns_resolve_time"] = None
-            elif not successful:
+            # Calculate overall status and the average response time in one pass.
+            # The average covers successful queries that reported latency, which
+            # avoids skew/ZeroDivision when some successful records have no timing.
+            succeeded = timed = 0
+            time_sum = 0.0
+            for r in dns_results:
+                if not r["success"]:
+                    continue
+                succeeded += 1
+                response_ms = r.get("response_time_ms")
+                if response_ms is not None:
+                    time_sum += response_ms
+                    timed += 1
+            if not succeeded:
                 self._stats["dns_status"] = t("failed")
                 self._stats["dns_resolve_time"] = None
             else:
-                # Use average response time across successful queries that reported latency.
-                # This avoids skew/ZeroDivision when some successful records have no timing.
-                times = [r.get("response_time_ms") for r in successful if r.get("response_time_ms") is not None]
-                self._stats["dns_resolve_time"] = (sum(times) / len(times)) if times else None
+                self._stats["dns_resolve_time"] = time_sum / timed if timed else None
                 # Status is ok only if all types succeeded
-                self._stats["dns_status"] = t("ok") if len(successful) == len(dns_results) else t("slow")
+                self._stats["dns_status"] = t("ok") if succeeded == len(dns_results) else t("slow")
 
     def update_dns_benchmark(self, benchmark_results: list[dict]) -> None:
         """Update DNS benchmark results (Cached/Uncached/DotCom).
@@ -335,6 +466,7 @@ class StatsRepository:
             return
             
         with self._lock:
+            self._version += 1
             try:
                 self._stats["dns_benchmark"] = {
                     r["test_type"]: {
@@ -377,6 +509,7 @@ class StatsRepository:
             return
             
         with self._lock:
+            self._version += 1
             try:
                 # Validate required fields
                 required_fields = ["score", "reliability", "records_ok", "records_total", "status"]
@@ -392,6 +525,7 @@ class StatsRepository:
     def update_mtu(self, local_mtu: int | None, path_mtu: int | None, status: str) -> None:
         """Update MTU info."""
         with self._lock:
+            self._version += 1
             self._stats["local_mtu"] = local_mtu
             self._stats["path_mtu"] = path_mtu
             self._stats["mtu_status"] = status
@@ -399,6 +533,7 @@ class StatsRepository:
     def update_ttl(self, ttl: int | None, hops: int | None) -> None:
         """Update TTL info."""
         with self._lock:
+            self._version += 1
             self._stats["last_ttl"] = ttl
             self._stats["ttl_hops"] = hops
             if ttl is not None:
@@ -407,6 +542,7 @@ class StatsRepository:
     def update_public_ip(self, ip: str, country: str, country_code: str | None) -> None:
         """Update public IP info."""
         with self._lock:
+            self._version += 1
             self._stats["public_ip"] = ip
             self._stats["country"] = country
             self._stats["country_code"] = country_code
@@ -414,6 +550,7 @@ class StatsRepository:
     def update_ip_change(self, old_ip: str, new_ip: str) -> None:
         """Record IP change."""
         with self._lock:
+            self._version += 1
             self._stats["previous_ip"] = old_ip
             self._stats["ip_change_time"] = datetime.now(timezone.utc)
 
@@ -426,7 +563,9 @@ class StatsRepository:
     ) -> None:
         """Update route analysis info."""
         with self._lock:
+            self._version += 1
             self._stats["route_hops"] = hops
+            self._stats["route_avg_latency"] = mean_hop_latency(hops)
             self._stats["route_problematic_hop"] = problematic_hop
             self._stats["route_changed"] = route_changed
             self._stats["route_last_diff_count"] = diff_count
@@ -439,6 +578,7 @@ class StatsRepository:
     ) -> None:
         """Update problem analysis results."""
         with self._lock:
+            self._version += 1
             self._stats["current_problem_type"] = problem_type
             self._stats["problem_prediction"] = prediction
             self._stats["problem_pattern"] = pattern
@@ -446,6 +586,7 @@ class StatsRepository:
     def update_threshold_state(self, key: str, value: bool) -> None:
         """Update a threshold state."""
         with self._lock:
+            self._version += 1
             self._stats["threshold_states"][key] = value
 
     def get_threshold_state(self, key: str) -> bool:
@@ -454,9 +595,13 @@ class StatsRepository:
             return self._stats["threshold_states"].get(key, False)
 
     def update_threshold_warmup(self, warmup_status: Dict[str, Dict[str, int]]) -> None:
-        """Update adaptive thresholds warmup status."""
+        """Update adaptive thresholds warmup status.
+
+        The status is copied here, once per update, and snapshots share that copy.
+        """
         with self._lock:
-            self._stats["threshold_warmup"] = warmup_status
+            self._version += 1
+            self._stats["threshold_warmup"] = dict(warmup_status)
 
     def get_consecutive_losses(self) -> int:
         """Get current consecutive losses count."""
@@ -466,6 +611,7 @@ class StatsRepository:
     def update_mtu_hysteresis(self, is_issue: bool) -> tuple[int, int]:
         """Update MTU hysteresis counters. Returns (consecutive_issues, consecutive_ok)."""
         with self._lock:
+            self._version += 1
             if is_issue:
                 self._stats["mtu_consecutive_issues"] = self._stats.get("mtu_consecutive_issues", 0) + 1
                 self._stats["mtu_consecutive_ok"] = 0
@@ -482,11 +628,13 @@ class StatsRepository:
     def set_mtu_status_change_time(self) -> None:
         """Record MTU status change time."""
         with self._lock:
+            self._version += 1
             self._stats["mtu_last_status_change"] = datetime.now(timezone.utc)
 
     def update_route_hysteresis(self, is_change: bool) -> tuple[int, int]:
         """Update route change hysteresis counters. Returns (consecutive_changes, consecutive_ok)."""
         with self._lock:
+            self._version += 1
             if is_change:
                 self._stats["route_consecutive_changes"] = self._stats.get("route_consecutive_changes", 0) + 1
                 self._stats["route_consecutive_ok"] = 0
@@ -498,6 +646,7 @@ class StatsRepository:
     def set_route_changed(self, changed: bool) -> None:
         """Set route changed flag with timestamp."""
         with self._lock:
+            self._version += 1
             self._stats["route_changed"] = changed
             self._stats["route_last_change_time"] = datetime.now(timezone.utc)
 
@@ -509,6 +658,7 @@ class StatsRepository:
     def set_traceroute_running(self, running: bool) -> None:
         """Set traceroute running state."""
         with self._lock:
+            self._version += 1
             self._stats["traceroute_running"] = running
             if running:
                 self._stats["last_traceroute_time"] = datetime.now(timezone.utc)
@@ -526,12 +676,15 @@ class StatsRepository:
     def update_hop_monitor(self, hops: list[dict], discovering: bool = False) -> None:
         """Update hop monitor data."""
         with self._lock:
+            self._version += 1
             self._stats["hop_monitor_hops"] = hops
+            self._hop_columns = build_hop_columns(hops)
             self._stats["hop_monitor_discovering"] = discovering
 
     def set_latest_version(self, version: str | None, up_to_date: bool) -> None:
         """Set the latest version info from version check."""
         with self._lock:
+            self._version += 1
             self._stats["latest_version"] = version
             self._stats["version_up_to_date"] = up_to_date
             self._stats["version_check_time"] = datetime.now(timezone.utc)
@@ -548,12 +701,14 @@ class StatsRepository:
     def update_app_traffic(self, sent_bytes: int = 0, recv_bytes: int = 0) -> None:
         """Accumulate estimated traffic generated by this application."""
         with self._lock:
+            self._version += 1
             self._stats["app_bytes_sent"] = self._stats.get("app_bytes_sent", 0) + max(0, sent_bytes)
             self._stats["app_bytes_recv"] = self._stats.get("app_bytes_recv", 0) + max(0, recv_bytes)
 
     def update_system_traffic(self, sent_bytes: int | None, recv_bytes: int | None) -> None:
         """Store session traffic totals for all network interfaces."""
         with self._lock:
+            self._version += 1
             self._stats["system_bytes_sent"] = None if sent_bytes is None else max(0, sent_bytes)
             self._stats["system_bytes_recv"] = None if recv_bytes is None else max(0, recv_bytes)
 
@@ -584,6 +739,7 @@ class StatsRepository:
             return None, None
 
         with self._lock:
+            self._version += 1
             if (
                 self._system_traffic_baseline is None
                 or sent_bytes < self._system_traffic_baseline[0]
@@ -638,6 +794,7 @@ class StatsRepository:
             alerts = self._stats.get("active_alerts", [])
             if len(alerts) > MAX_ALERTS_HISTORY:
                 removed = len(alerts) - MAX_ALERTS_HISTORY
+                self._version += 1
                 self._stats["active_alerts"] = alerts[-MAX_ALERTS_HISTORY:]
                 cleaned["alerts"] = removed
             
@@ -670,6 +827,7 @@ class StatsRepository:
         from config import MAX_ACTIVE_ALERTS
         
         with self._lock:
+            self._version += 1
             self._stats.setdefault("active_alerts", []).append(
                 {"message": message, "type": alert_type, "time": datetime.now(timezone.utc)}
             )
@@ -710,8 +868,12 @@ class StatsRepository:
         
         now = datetime.now(timezone.utc)
         with self._lock:
-            self._stats["active_alerts"] = [
+            alerts = self._stats.get("active_alerts", [])
+            kept = [
                 a
-                for a in self._stats.get("active_alerts", [])
+                for a in alerts
                 if a["time"] is not None and (now - ensure_utc(a["time"])).total_seconds() < ALERT_DISPLAY_TIME
             ]
+            if len(kept) < len(alerts):
+                self._version += 1
+            self._stats["active_alerts"] = kept
@@ -0,0 +1,15 @@
+"""Tests for geolocation service helpers."""
+from services import geo_service
+
+
+def test_clean_asn_strips_leading_prefix_only():
+    """Only the AS number prefix is removed; names containing "AS" survive."""
+    assert geo_service._clean_asn("AS15169 Google LLC") == "15169 Google LLC"
+    assert geo_service._clean_asn("as3320 Deutsche Telekom AG") == "3320 Deutsche Telekom AG"
+    assert geo_service._clean_asn("AS7018 AT&T Services, Inc. (NASA)") == "7018 AT&T Services, Inc. (NASA)"
+
+
+def test_clean_asn_accepts_missing_and_numeric_values():
+    """Fallback providers may omit the field or return a bare number."""
+    assert geo_service._clean_asn(None) == ""
+    assert geo_service._clean_asn(13335) == "13335"
@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import pytest
+from collections import deque
 from datetime import datetime, timezone
-from stats_repository import StatsRepository
+from unittest import mock
+from config import t
+from stats_repository import StatsRepository, median_p95_sorted
 
 
 class TestStatsRepository:
@@ -166,6 +169,20 @@ class TestStatsRepository:
         assert "A" in stats["dns_results"]
         assert stats["dns_results"]["A"]["success"] is True
         assert stats["dns_results"]["AAAA"]["success"] is False
+        assert stats["dns_resolve_time"] == 10.0
+        assert stats["dns_status"] == t("slow")
+
+    def test_update_dns_detailed_average_skips_untimed_successes(self) -> None:
+        """Test that the resolve time averages only successful records that reported timing."""
+        repo = StatsRepository()
+        repo.update_dns_detailed([
+            {"record_type": "A", "success": True, "response_time_ms": 10.0, "status": "ok"},
+            {"record_type": "NS", "success": True, "response_time_ms": None, "status": "ok"},
+            {"record_type": "MX", "success": True, "response_time_ms": 30.0, "status": "ok"},
+        ])
+        stats = repo.get_stats()
+        assert stats["dns_resolve_time"] == 20.0
+        assert stats["dns_status"] == t("ok")
 
     def test_update_dns_detailed_empty(self) -> None:
         """Test detailed DNS update with empty results."""
@@ -310,6 +327,37 @@ class TestStatsRepository:
         assert stats["route_changed"] is True
         assert stats["route_last_diff_count"] == 1
 
+    def test_snapshot_version_tracks_changes(self) -> None:
+        """Test that the snapshot version changes on updates and not on reads."""
+        repo = StatsRepository()
+        first = repo.get_snapshot()["version"]
+        repo.get_recent_loss_pct()
+        assert repo.get_snapshot()["version"] == first
+        repo.update_ttl(52, 12)
+        second = repo.get_snapshot()["version"]
+        assert second != first
+        repo.clean_old_alerts()
+        assert repo.get_snapshot()["version"] == second
+
+    def test_expired_alert_bumps_version(self) -> None:
+        """Test that cleanups which drop an alert change the snapshot version."""
+        repo = StatsRepository()
+        repo.add_alert("old")
+        before = repo.get_snapshot()["version"]
+        with mock.patch("config.ALERT_DISPLAY_TIME", 0):
+            repo.clean_old_alerts()
+        snap = repo.get_snapshot()
+        assert snap["active_alerts"] == []
+        assert snap["version"] != before
+
+    def test_route_avg_latency_in_snapshot(self) -> None:
+        """Test that the mean hop latency is computed on update, skipping hops without one."""
+        repo = StatsRepository()
+        assert repo.get_snapshot()["route_avg_latency"] is None
+        hops = [{"hop": 1, "avg_latency": 2.0}, {"hop": 2}, {"hop": 3, "avg_latency": 6.0}]
+        repo.update_route(hops, problematic_hop=None, route_changed=False)
+        assert repo.get_snapshot()["route_avg_latency"] == 4.0
+
     def test_update_problem_analysis(self) -> None:
         """Test problem analysis update."""
         repo = StatsRepository()
@@ -358,6 +406,79 @@ class TestStatsRepository:
         stats = repo.get_stats()
         assert stats["total"] == 1
 
+    def test_snapshot_hop_columns(self) -> None:
+        """Test update_hop_monitor exposes normalized per-hop columns."""
+        repo = StatsRepository()
+        assert repo.get_snapshot()["hop_monitor_columns"]["hop"] == ()
+
+        repo.update_hop_monitor([
+            {"hop": 1, "ip": "10.0.0.1", "hostname": "gw", "last_latency": 1.5, "latency_history": [1.0, None, 2.0]},
+            {"hop": 2, "ip": "10.0.0.2", "loss_pct": None, "last_ok": False},
+        ])
+        columns = repo.get_snapshot()["hop_monitor_columns"]
+        assert columns["hop"] == (1, 2)
+        assert columns["hostname"] == ("gw", "10.0.0.2")
+        assert columns["loss_pct"] == (0.0, 0.0)
+        assert columns["last_ok"] == (True, False)
+        assert columns["latency_history"] == ((1.0, 2.0), ())
+
+    def test_snapshot_loss_percentages(self) -> None:
+        """Test get_snapshot precomputes success and loss percentages."""
+        repo = StatsRepository()
+        empty = repo.get_snapshot()
+        assert empty["success_rate"] == 0.0
+        assert empty["loss_total_pct"] == 0.0
+        assert empty["loss_recent_pct"] == 0.0
+
+        for ok in (True, True, True, False):
+            repo.update_after_ping(ok, 10.0 if ok else None)
+        snapshot = repo.get_snapshot()
+        assert snapshot["success_rate"] == 75.0
+        assert snapshot["loss_total_pct"] == 25.0
+        assert snapshot["loss_recent_pct"] == 25.0
+
+    def test_recent_loss_tracks_window_eviction(self) -> None:
+        """Running failure count stays equal to a full recount as the window slides."""
+        repo = StatsRepository()
+        repo._recent_results = deque(maxlen=4)
+        pattern = [False, True, False, False, True, True, True, True, False, True]
+        for ok in pattern:
+            repo.update_after_ping(ok, 10.0 if ok else None)
+            recent = repo.get_recent_results()
+            expected = recent.count(False) / len(recent) * 100
+            assert repo.get_recent_loss_pct() == expected
+            assert repo.get_snapshot()["loss_recent_pct"] == expected
+
+    def test_latency_percentiles_track_window_eviction(self) -> None:
+        """Snapshot median/p95 match a full re-sort of the sliding latency window."""
+        repo = StatsRepository()
+        repo.get_stats()["latencies"] = deque(maxlen=25)
+        for i in range(60):
+            repo.update_after_ping(True, float((i * 37) % 50))
+            snapshot = repo.get_snapshot()
+            expected = median_p95_sorted(sorted(snapshot["latencies"]))
+            assert (snapshot["latency_median"], snapshot["latency_p95"]) == expected
+
+    def test_history_copies_shared_until_next_ping(self) -> None:
+        """Snapshots between pings share the latency copy; a ping refreshes it."""
+        repo = StatsRepository()
+        repo.update_after_ping(True, 10.0)
+        first = repo.get_snapshot()["latencies"]
+        assert repo.get_snapshot()["latencies"] is first
+        repo.update_after_ping(True, 20.0)
+        assert repo.get_snapshot()["latencies"] == [10.0, 20.0]
+        assert first == [10.0]
+
+    def test_threshold_warmup_copied_on_update(self) -> None:
+        """Warmup status is copied once on update and shared by snapshots."""
+        repo = StatsRepository()
+        status = {"latency": {"samples": 3, "min_samples": 5}}
+        repo.update_threshold_warmup(status)
+        status["jitter"] = {"samples": 1, "min_samples": 5}
+        snapshot = repo.get_snapshot()
+        assert snapshot["threshold_warmup"] == {"latency": {"samples": 3, "min_samples": 5}}
+        assert repo.get_snapshot()["threshold_warmup"] is snapshot["threshold_warmup"]
+
     def test_recent_results(self) -> None:
         """Test recent results tracking."""
         repo = StatsRepository()
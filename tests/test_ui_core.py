@@ -0,0 +1,442 @@
+"""Tests for MonitorUI frame generation and panel caching."""
+from __future__ import annotations
+
+import io
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from rich.console import Console, ConsoleDimensions
+from rich.live import Live
+
+from config import t
+from stats_repository import StatsRepository
+from ui import MonitorUI
+from ui.core import (
+    MIN_FRAME_INTERVAL,
+    PANEL_REFRESH_INTERVALS,
+    UNCHANGED_FRAME_HEARTBEAT,
+    _layout_geometry,
+)
+from ui.helpers import DIM_DASH, lat_color
+from ui.panels import hops as hops_panel
+from ui.panels.analysis import analysis_content, render_analysis_panel
+from ui.panels.footer import _home_relative, render_footer
+from ui.panels.metrics import render_metrics_panel
+
+
+class _RepoProvider:
+    """Minimal StatsDataProvider backed by a real StatsRepository."""
+
+    def __init__(self, repo: StatsRepository) -> None:
+        self.repo = repo
+
+    def get_stats_snapshot(self):
+        return self.repo.get_snapshot()
+
+
+def _make_ui(width: int = 120, height: int = 40) -> tuple[MonitorUI, StatsRepository]:
+    repo = StatsRepository()
+    console = Console(record=True, width=width, height=height, file=io.StringIO())
+    return MonitorUI(console, _RepoProvider(repo), min_frame_interval=0.0), repo
+
+
+class _Clock:
+    """Settable stand-in for ``time.monotonic``."""
+
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAnalysisThrottle:
+    """Analysis panel is rebuilt at most once per refresh interval."""
+
+    def test_reuses_panel_within_interval(self) -> None:
+        ui, _ = _make_ui()
+        with mock.patch("ui.core.render_analysis_panel", wraps=render_analysis_panel) as spy:
+            ui.generate_layout()
+            ui.generate_layout()
+        assert spy.call_count == 1
+
+    def test_rebuilds_after_interval(self) -> None:
+        ui, repo = _make_ui()
+        clock = _Clock()
+        interval = PANEL_REFRESH_INTERVALS["analysis"]
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch("ui.core.render_analysis_panel", wraps=render_analysis_panel) as spy:
+            ui.generate_layout()
+            repo.update_problem_analysis(t("problem_isp"), t("prediction_risk"), "periodic")
+            clock.now += interval / 2
+            ui.generate_layout()
+            clock.now += interval
+            ui.generate_layout()
+        assert spy.call_count == 2
+
+    def test_unchanged_analysis_reused_after_interval(self) -> None:
+        ui, _ = _make_ui()
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch("ui.core.render_analysis_panel", wraps=render_analysis_panel) as spy:
+            ui.generate_layout()
+            clock.now += PANEL_REFRESH_INTERVALS["analysis"] * 4
+            ui.generate_layout()
+        assert spy.call_count == 1
+
+    def test_running_traceroute_ignores_elapsed_time(self) -> None:
+        _, repo = _make_ui()
+        repo.set_traceroute_running(True)
+        snap = repo.get_snapshot()
+        now = datetime.now(timezone.utc)
+        assert analysis_content(snap, now) == analysis_content(snap, now + timedelta(minutes=5))
+
+    def test_hop_panel_throttled_within_interval(self) -> None:
+        ui, repo = _make_ui()
+        repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 5.0}])
+        with mock.patch("ui.core.render_hop_panel") as spy:
+            ui.generate_layout()
+            repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 9.0}])
+            ui.generate_layout()
+        assert spy.call_count == 1
+
+    def test_unchanged_hops_reused_after_interval(self) -> None:
+        ui, repo = _make_ui()
+        repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 5.0}])
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch("ui.core.render_hop_panel") as spy:
+            ui.generate_layout()
+            clock.now += PANEL_REFRESH_INTERVALS["hops"] * 4
+            ui.generate_layout()
+            assert spy.call_count == 1
+            repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 9.0}])
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+    def test_connection_loss_bypasses_cache(self) -> None:
+        ui, repo = _make_ui()
+        ui.generate_layout()
+        repo.update_threshold_state("connection_lost", True)
+        ui.console.print(ui.generate_layout())
+        assert t("status_disconnected") in ui.console.export_text()
+
+
+class TestHopRowCache:
+    """Hop rows are formatted once per distinct hop state."""
+
+    def test_unchanged_hop_reuses_row(self) -> None:
+        ui, repo = _make_ui()
+        repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 5.0, "avg_latency": 5.0}])
+        clock = _Clock()
+        interval = PANEL_REFRESH_INTERVALS["hops"]
+        builders = tuple(mock.Mock(wraps=build) for build in hops_panel._ROW_BUILDERS)
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch.object(hops_panel, "_ROW_BUILDERS", builders):
+            ui.generate_layout()
+            clock.now += interval
+            ui.generate_layout()
+            assert sum(build.call_count for build in builders) == 1
+            repo.update_hop_monitor([{"hop": 1, "ip": "10.0.0.1", "last_latency": 9.0, "avg_latency": 6.0}])
+            clock.now += interval
+            ui.generate_layout()
+            assert sum(build.call_count for build in builders) == 2
+
+    def test_evicts_least_recently_drawn_row(self) -> None:
+        repo = StatsRepository()
+        cache: OrderedDict = OrderedDict()
+
+        def draw(*hop_nums: int) -> None:
+            repo.update_hop_monitor([
+                {"hop": n, "ip": f"10.0.0.{n}", "last_latency": 5.0, "avg_latency": 5.0} for n in hop_nums
+            ])
+            hops_panel.render_hop_panel(repo.get_snapshot(), 120, "wide", "full", row_cache=cache)
+
+        with mock.patch.object(hops_panel, "ROW_CACHE_MAX", 2):
+            draw(1, 2)
+            draw(1)
+            draw(3)
+        assert [key[0][0] for key in cache] == [1, 3]
+
+
+class TestLayoutGeometry:
+    """Section heights and the drawn hop count come from one helper."""
+
+    def test_short_terminal_caps_hops(self) -> None:
+        geom = _layout_geometry(40, False, "short", 12, False)
+        assert geom.max_hops == 8
+        assert geom.hop_panel_h == 13
+        assert geom.body_h == 40 - (4 + 4 + 3) - 13
+
+    def test_hop_panel_limited_to_two_thirds(self) -> None:
+        geom = _layout_geometry(24, True, "standard", 30, True)
+        assert (geom.header_h, geom.toast_h, geom.max_hops) == (3, 3, 30)
+        assert geom.hop_panel_h == (24 - 12) * 2 // 3
+        assert geom.body_h == 8
+
+    def test_no_hops(self) -> None:
+        assert _layout_geometry(40, False, "full", 0, False).hop_panel_h == 4
+
+
+class TestFmtLatency:
+    """Hop latency cells use the same thresholds as lat_color."""
+
+    def test_matches_lat_color_at_boundaries(self) -> None:
+        good, warn = hops_panel.HOP_LATENCY_GOOD, hops_panel.HOP_LATENCY_WARN
+        for value in (0, good, good + 0.5, warn, warn + 1, "12.4"):
+            color = lat_color(float(value))
+            assert hops_panel._fmt_latency(value) == f"[{color}]{float(value):.0f}[/{color}]"
+        assert hops_panel._fmt_latency(None) == DIM_DASH
+
+
+class TestWorstHop:
+    """The hop flagged under the table matches the previous in-loop scan."""
+
+    def test_last_down_hop_wins(self) -> None:
+        assert hops_panel._worst_hop((True, False, True, False), (5.0, None, 90.0, None)) == (3, float("inf"))
+
+    def test_first_highest_latency(self) -> None:
+        assert hops_panel._worst_hop((True, True, True), (20.0, None, 20.0)) == (0, 20.0)
+
+    def test_nothing_to_flag(self) -> None:
+        assert hops_panel._worst_hop((True, True), (None, 0.0)) == (-1, 0.0)
+
+
+class TestPanelCache:
+    """Static panels are rebuilt only when their inputs change."""
+
+    def test_footer_reused_until_inputs_change(self) -> None:
+        ui, repo = _make_ui()
+        with mock.patch("ui.core.render_footer", wraps=render_footer) as spy:
+            ui.generate_layout()
+            ui.generate_layout()
+            assert spy.call_count == 1
+            repo.set_latest_version("9.9.9", False)
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+    def test_metrics_reused_until_next_ping(self) -> None:
+        ui, repo = _make_ui()
+        with mock.patch("ui.core.render_metrics_panel", wraps=render_metrics_panel) as spy:
+            ui.generate_layout()
+            ui.generate_layout()
+            assert spy.call_count == 1
+            repo.update_after_ping(True, 12.0)
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+
+class TestAnalysisNetworkSection:
+    """Network rows read the TTL and MTU fields the snapshot actually carries."""
+
+    def test_shows_ttl_and_path_mtu(self) -> None:
+        repo = StatsRepository()
+        repo.update_ttl(57, 7)
+        repo.update_mtu(1500, 1492, t("mtu_low"))
+        console = Console(record=True, width=120, file=io.StringIO())
+        console.print(render_analysis_panel(repo.get_snapshot(), width=100, tier="standard", h_tier="standard"))
+        rendered = console.export_text()
+        assert "57" in rendered
+        assert "1492" in rendered
+
+
+class TestAnalysisBenchmark:
+    """Benchmark line reads results keyed by test type."""
+
+    def test_shows_each_test_type(self) -> None:
+        repo = StatsRepository()
+        repo.update_dns_benchmark([
+            {"test_type": "cached", "domain": "a.example", "success": True, "status": t("ok"),
+             "response_time_ms": 8.2, "avg_ms": 8.5},
+            {"test_type": "uncached", "domain": "b.example", "success": True, "status": t("slow"),
+             "response_time_ms": 142.0, "avg_ms": 139.6},
+            {"test_type": "dotcom", "domain": "c.example", "success": False, "status": t("failed")},
+        ])
+        console = Console(record=True, width=120, file=io.StringIO())
+        console.print(render_analysis_panel(repo.get_snapshot(), width=100, tier="standard", h_tier="full"))
+        rendered = console.export_text()
+        assert "C:8 /8" in rendered
+        assert "U:142 /140" in rendered
+        assert "D:fail" in rendered
+
+
+class TestAnalysisDnsTable:
+    """DNS table lists known record types in fixed order, then any others."""
+
+    def test_extra_record_types_follow_known_ones(self) -> None:
+        repo = StatsRepository()
+        repo.update_dns_detailed([
+            {"record_type": rt, "success": True, "status": t("ok"), "response_time_ms": 10.0, "records": ["x"]}
+            for rt in ("SRV", "MX", "A", "PTR")
+        ])
+        console = Console(record=True, width=120, file=io.StringIO())
+        console.print(render_analysis_panel(repo.get_snapshot(), width=100, tier="standard", h_tier="standard"))
+        rows = [line.split()[1] for line in console.export_text().splitlines()
+                if line.split()[1:2] and line.split()[1] in ("A", "MX", "PTR", "SRV")]
+        assert rows == ["A", "MX", "PTR", "SRV"]
+
+
+class TestFrameSnapshot:
+    """Every panel of a frame reads the same single snapshot."""
+
+    def test_one_snapshot_per_frame(self) -> None:
+        for width in (80, 120, 200):
+            ui, _ = _make_ui(width=width)
+            with mock.patch.object(ui.data_provider, "get_stats_snapshot",
+                                   wraps=ui.data_provider.get_stats_snapshot) as spy:
+                ui.generate_layout()
+                assert spy.call_count == 1
+
+    def test_console_size_read_once_per_frame(self) -> None:
+        ui, _ = _make_ui()
+        with mock.patch.object(Console, "size", new_callable=mock.PropertyMock,
+                               return_value=ConsoleDimensions(120, 40)) as size:
+            ui.generate_layout()
+        assert size.call_count == 1
+
+
+class _NoClock(datetime):
+    """``datetime`` whose ``now`` fails: panels must use the frame's time."""
+
+    @classmethod
+    def now(cls, tz=None):  # type: ignore[override]
+        raise AssertionError("clock read outside begin_frame")
+
+
+class TestFrameClock:
+    """The wall clock is read once per frame and passed down to the panels."""
+
+    def test_panels_use_frame_time(self) -> None:
+        ui, repo = _make_ui()
+        started = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        repo.set_start_time(started)
+        repo.update_after_ping(False, None)
+        with mock.patch("ui.helpers.datetime", _NoClock), \
+                mock.patch("ui.panels.header.datetime", _NoClock), \
+                mock.patch("ui.panels.analysis.datetime", _NoClock):
+            ui.console.print(ui.generate_layout())
+
+
+class TestFrameCoalescing:
+    """Back-to-back layout requests reuse the previous frame."""
+
+    def _ui(self) -> tuple[MonitorUI, StatsRepository]:
+        repo = StatsRepository()
+        console = Console(record=True, width=120, height=40, file=io.StringIO())
+        return MonitorUI(console, _RepoProvider(repo)), repo
+
+    def test_reuses_layout_within_frame_interval(self) -> None:
+        ui, _ = self._ui()
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch.object(ui, "_build_layout", wraps=ui._build_layout) as spy:
+            first = ui.generate_layout()
+            clock.now += MIN_FRAME_INTERVAL / 2
+            assert ui.generate_layout() is first
+            assert spy.call_count == 1
+            clock.now += UNCHANGED_FRAME_HEARTBEAT
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+    def test_unchanged_snapshot_reused_until_heartbeat(self) -> None:
+        ui, repo = self._ui()
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch.object(ui, "_build_layout", wraps=ui._build_layout) as spy:
+            ui.generate_layout()
+            clock.now += MIN_FRAME_INTERVAL * 2
+            ui.generate_layout()
+            assert spy.call_count == 1
+            repo.update_after_ping(True, 12.0)
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+    def test_slow_data_change_rebuilds_before_heartbeat(self) -> None:
+        ui, repo = self._ui()
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch.object(ui, "_build_layout", wraps=ui._build_layout) as spy:
+            ui.generate_layout()
+            clock.now += MIN_FRAME_INTERVAL * 2
+            repo.update_mtu(1500, 1400, t("mtu_low"))
+            ui.generate_layout()
+            assert spy.call_count == 2
+
+    def test_force_bypasses_coalescing(self) -> None:
+        ui, _ = self._ui()
+        clock = _Clock()
+        with mock.patch("ui.core.time.monotonic", clock), \
+                mock.patch.object(ui, "_build_layout", wraps=ui._build_layout) as spy:
+            ui.generate_layout()
+            ui.generate_layout(force=True)
+            assert spy.call_count == 2
+
+
+class TestFooterLogPath:
+    """Only a leading home directory is shortened to ``~`` in the footer."""
+
+    def test_home_prefix_only(self) -> None:
+        home = os.path.join(os.sep, "home", "u")
+        assert _home_relative(os.path.join(home, "ping.log"), home) == os.path.join("~", "ping.log")
+        assert _home_relative(home + "2" + os.sep + "ping.log", home) == home + "2" + os.sep + "ping.log"
+        other = os.path.join(os.sep, "data") + home + os.sep + "ping.log"
+        assert _home_relative(other, home) == other
+
+
+class TestLayoutTreeReuse:
+    """The layout tree is built once per arrangement and refilled each frame."""
+
+    def test_same_tree_new_panels(self) -> None:
+        ui, repo = _make_ui()
+        first = ui.generate_layout()
+        footer = first["footer"].renderable
+        repo.set_latest_version("9.9.9", False)
+        second = ui.generate_layout()
+        assert second is first
+        assert second["footer"].renderable is not footer
+
+    def test_standard_and_wide_share_tree(self) -> None:
+        ui, _ = _make_ui(width=120)
+        first = ui.generate_layout()
+        ui.console.width = 200
+        assert ui.generate_layout() is first
+
+    def test_toast_switches_tree(self) -> None:
+        ui, repo = _make_ui()
+        first = ui.generate_layout()
+        repo.add_alert("boom", "critical")
+        with mock.patch("ui.panels.toast.SHOW_VISUAL_ALERTS", True):
+            second = ui.generate_layout()
+        assert second is not first
+        assert second["toast"].size == 3
+
+
+class _CountingFile(io.StringIO):
+    """Terminal stand-in that counts ``write`` calls."""
+
+    writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+    def isatty(self) -> bool:
+        return True
+
+
+class TestFrameOutput:
+    """Each drawn frame reaches the terminal as a single write."""
+
+    def test_one_write_per_frame(self) -> None:
+        repo = StatsRepository()
+        out = _CountingFile()
+        console = Console(file=out, width=120, height=40, force_terminal=True)
+        ui = MonitorUI(console, _RepoProvider(repo), min_frame_interval=0.0)
+        with Live(console=console, auto_refresh=False, redirect_stdout=False, redirect_stderr=False) as live:
+            before = out.writes
+            for i in range(3):
+                repo.update_after_ping(True, 10.0 + i)
+                live.update(ui.generate_layout(), refresh=True)
+            assert out.writes - before == 3
@@ -1,14 +1,21 @@
 """Tests for ui/helpers.py."""
 from __future__ import annotations
 
+import random
+from collections import deque
+import statistics
+
 import pytest
 from datetime import datetime, timedelta, timezone
+from rich.console import Console
+from rich.text import Text
 from ui.helpers import (
     fmt_uptime,
     fmt_since,
     fmt_bytes,
     progress_bar,
     sparkline,
+    sparkline_text,
     sparkline_mini,
     sparkline_double,
     mini_gauge,
@@ -16,12 +23,21 @@ from ui.helpers import (
     kv_table,
     dual_kv_table,
     section_header,
+    markup_text,
     truncate,
     render_trend_arrow,
     lat_color,
+    loss_color,
+    response_ms_color,
+    latency_median_p95,
+    recent_loss_pct,
     get_connection_state,
     ensure_utc,
+    dim_label,
+    key_label,
+    t,
 )
+from config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN
 from ui.theme import GREEN, YELLOW, RED
 
 
@@ -114,6 +130,13 @@ class TestFmtSince:
             assert "5" in result
             assert len(result) > 0
 
+    def test_hours_ago_ignores_seconds(self) -> None:
+        """Past the first minute, seconds do not change the text."""
+        ts = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        first = fmt_since(ts, ts + timedelta(hours=2, minutes=3, seconds=1))
+        assert fmt_since(ts, ts + timedelta(hours=2, minutes=3, seconds=59)) == first
+        assert fmt_since(ts, ts + timedelta(hours=2, minutes=4)) != first
+
 
 class TestFmtBytes:
     """Test fmt_bytes helper."""
@@ -204,6 +227,35 @@ class TestSparkline:
         result = sparkline([0.0, 0.0, 0.0])
         assert len(result) > 0
 
+    def test_deque_matches_list(self) -> None:
+        """Test that a deque renders the same tail as the equivalent list."""
+        values = [float(v) for v in range(1, 60)]
+        assert sparkline(deque(values), 12) == sparkline(values, 12)
+
+    def test_precomputed_bounds_match_scan(self) -> None:
+        """Test that supplying (min, max) gives the same sparkline as scanning."""
+        values = [12.0, 0.0, 30.5, 18.2, 44.0, 9.9]
+        assert sparkline(values, 8, bounds=(9.9, 44.0)) == sparkline(values, 8)
+
+
+class TestSparklineText:
+    """Test sparkline_text function."""
+
+    def test_matches_markup_sparkline(self) -> None:
+        """The Text carries the same glyphs and per-cell styles as the markup version."""
+        console = Console()
+        values = [10.0, 12.0, 0.0, 30.0, 80.0, 15.0, 90.0]
+        text = sparkline_text(values, width=6)
+        expected = Text.from_markup(sparkline(values, width=6))
+        assert text.plain == expected.plain
+        assert [str(text.get_style_at_offset(console, i)) for i in range(len(text))] == [
+            str(expected.get_style_at_offset(console, i)) for i in range(len(expected))
+        ]
+
+    def test_placeholder(self) -> None:
+        """Too little data gives the dim placeholder."""
+        assert sparkline_text([5.0]).plain == Text.from_markup(sparkline([5.0])).plain
+
 
 class TestSparklineMini:
     """Test sparkline_mini function."""
@@ -335,6 +387,14 @@ class TestDualKvTable:
         table = dual_kv_table(80)
         assert table is not None
 
+    def test_tables_do_not_share_rows(self) -> None:
+        """Tables built from the cached column layout keep their own cells."""
+        first = dual_kv_table(80)
+        first.add_row("a:", "1", "b:", "2")
+        second = dual_kv_table(80)
+        assert second.row_count == 0
+        assert [len(list(col.cells)) for col in second.columns] == [0, 0, 0, 0]
+
 
 class TestSectionHeader:
     """Test section_header function."""
@@ -345,6 +405,39 @@ class TestSectionHeader:
         assert result is not None
         assert "TEST" in str(result)
 
+    def test_reused_per_label_and_width(self) -> None:
+        assert section_header("Test", 80) is section_header("Test", 80)
+        assert section_header("Test", 60) is not section_header("Test", 80)
+
+
+class TestMarkupText:
+    """Test markup_text function."""
+
+    def test_parses_once_per_markup(self) -> None:
+        """Identical markup is parsed a single time and matches Text.from_markup."""
+        markup = "[green]12[/green] ms"
+        result = markup_text(markup)
+        assert markup_text(markup) is result
+        assert result == Text.from_markup(markup)
+
+
+class TestDimLabel:
+    """Test dim_label function."""
+
+    def test_built_once(self) -> None:
+        """The label is built once and shared by later calls."""
+        first = dim_label("sent")
+        assert dim_label("sent") is first
+        assert first.plain == t("sent")
+
+
+class TestKeyLabel:
+    """Test key_label function."""
+
+    def test_appends_colon_to_translation(self) -> None:
+        """The row key is the translated label followed by a colon."""
+        assert key_label("sent") == f"{t('sent')}:"
+
 
 class TestTruncate:
     """Test truncate function."""
@@ -413,6 +506,60 @@ class TestLatColor:
         result = lat_color(150.0)
         assert result == RED
 
+    def test_thresholds_are_inclusive(self) -> None:
+        """Latency equal to a threshold keeps the better color."""
+        assert lat_color(HOP_LATENCY_GOOD) == GREEN
+        assert lat_color(HOP_LATENCY_WARN) == YELLOW
+
+
+class TestLossColor:
+    """Test loss_color function."""
+
+    def test_thresholds(self) -> None:
+        """Loss of 1% turns yellow and 5% turns red."""
+        assert [loss_color(pct) for pct in (0.0, 0.99, 1.0, 4.99, 5.0)] == [GREEN, GREEN, YELLOW, YELLOW, RED]
+
+
+class TestResponseMsColor:
+    """Test response_ms_color function."""
+
+    def test_thresholds(self) -> None:
+        """Responses from 50 ms are yellow and from 150 ms red."""
+        assert [response_ms_color(ms) for ms in (10.0, 50.0, 149.9, 150.0)] == [GREEN, YELLOW, YELLOW, RED]
+
+
+class TestLatencyMedianP95:
+    """Test latency_median_p95 function."""
+
+    def test_empty(self) -> None:
+        """Test that no samples yield no statistics."""
+        assert latency_median_p95([]) == (None, None)
+
+    def test_small_window_uses_max_for_p95(self) -> None:
+        """Test that fewer than 20 samples fall back to the maximum."""
+        assert latency_median_p95([3.0, 1.0, 2.0, 4.0]) == (2.5, 4.0)
+
+    @pytest.mark.parametrize("size", [20, 21, 57, 300])
+    def test_matches_statistics_module(self, size: int) -> None:
+        """Test that results match statistics.median/quantiles exactly."""
+        rng = random.Random(size)
+        data = [rng.uniform(1.0, 250.0) for _ in range(size)]
+        med, p95 = latency_median_p95(data)
+        assert med == statistics.median(data)
+        assert p95 == statistics.quantiles(data, n=20)[18]
+
+
+class TestRecentLossPct:
+    """Test recent_loss_pct function."""
+
+    def test_empty_window(self) -> None:
+        """Test that an empty window reports no loss."""
+        assert recent_loss_pct([]) == 0.0
+
+    def test_partial_loss(self) -> None:
+        """Test loss percentage over a mixed window."""
+        assert recent_loss_pct([True, False, True, False]) == 50.0
+
 
 class TestGetConnectionState:
     """Test get_connection_state function."""
@@ -452,6 +599,31 @@ class TestGetConnectionState:
         label, color, icon = get_connection_state(snap)
         assert label is not None
 
+    def test_precomputed_loss_is_used(self) -> None:
+        """Test that a caller-supplied loss percentage overrides the window scan."""
+        snap = {
+            "threshold_states": {"connection_lost": False},
+            "recent_results": [True] * 10,
+            "last_status": "OK",
+        }
+        assert get_connection_state(snap, loss30=50.0)[1] == YELLOW
+
+    def test_snapshot_loss_is_used(self) -> None:
+        """Test that the snapshot's recent loss percentage is used over the window scan."""
+        snap = {
+            "threshold_states": {"connection_lost": False},
+            "recent_results": [True] * 10,
+            "loss_recent_pct": 50.0,
+            "last_status": "OK",
+        }
+        assert get_connection_state(snap)[1] == YELLOW
+
+    def test_connection_lost_argument_skips_threshold_lookup(self) -> None:
+        """Test that a caller-supplied connection flag is used without the threshold states."""
+        snap = {"recent_results": [True] * 10, "loss_recent_pct": 0.0, "last_status": "OK"}
+        assert get_connection_state(snap, connection_lost=True)[1] == RED
+        assert get_connection_state(snap, connection_lost=False)[1] == GREEN
+
 
 class TestEnsureUtc:
     """Test ensure_utc function (re-exported from config.types)."""
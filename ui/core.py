@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
-from rich.console import Console
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from rich.console import Console, ConsoleDimensions
 from rich.layout import Layout
+from rich.panel import Panel
+from rich.text import Text
 
 from ui.theme import HeightTier, LayoutTier
-from ui.panels.analysis import render_analysis_panel
+from ui.helpers import fmt_uptime
+from ui.panels.analysis import analysis_content, render_analysis_panel
 from ui.panels.dashboard import render_dashboard
 from ui.panels.footer import render_footer
 from ui.panels.header import render_header
@@ -21,28 +31,134 @@ except ImportError:
 
 from ui_protocols.protocols import StatsDataProvider
 
+if TYPE_CHECKING:
+    from stats_repository import StatsSnapshot
+
+# Return type of a panel builder; the toast builder is the one that may return None.
+_PanelT = TypeVar("_PanelT", bound="Panel | None")
+
+# Minimum seconds between rebuilds of panels whose data changes more slowly than
+# the UI ticks. Route, MTU, DNS and traceroute data (analysis) change on a scale of
+# seconds to minutes; hop metrics arrive at the hop ping interval. Past the interval
+# a panel is still reused while the content it shows is unchanged.
+PANEL_REFRESH_INTERVALS: dict[str, float] = {
+    "analysis": 2.0,
+    "hops": 0.5,
+}
+
+# Layout requests arriving closer together than this (seconds) reuse the previous
+# frame, capping rendering at about 15 fps however often the caller asks.
+MIN_FRAME_INTERVAL = 1 / 15
+
+# A frame whose snapshot version is unchanged is reused for up to this many
+# seconds; the heartbeat keeps the header clock and uptime ticking.
+UNCHANGED_FRAME_HEARTBEAT = 1.0
+
+
+@dataclass(frozen=True)
+class _LayoutGeom:
+    """Row heights of the frame's sections and the number of hops drawn."""
+
+    header_h: int
+    dashboard_h: int
+    toast_h: int
+    footer_h: int
+    max_hops: int
+    hop_panel_h: int
+    body_h: int
+
+
+@lru_cache(maxsize=32)
+def _layout_geometry(
+    height: int, is_compact: bool, h_tier: HeightTier, len_hops: int, has_toast: bool
+) -> _LayoutGeom:
+    """Resolve the section heights once per terminal height and hop count."""
+    if h_tier == "minimal":
+        max_hops = 5
+    elif h_tier == "short":
+        max_hops = 8
+    else:
+        max_hops = len_hops
+    header_h = dashboard_h = 3 if is_compact else 4
+    toast_h = 3 if has_toast else 0
+    footer_h = 3
+    remaining = height - (header_h + dashboard_h + footer_h + toast_h)
+    hop_panel_h = min(len_hops, max_hops) + 5 if len_hops else 4
+    hop_panel_h = min(hop_panel_h, max(4, remaining * 2 // 3))
+    return _LayoutGeom(
+        header_h=header_h,
+        dashboard_h=dashboard_h,
+        toast_h=toast_h,
+        footer_h=footer_h,
+        max_hops=max_hops,
+        hop_panel_h=hop_panel_h,
+        body_h=max(8, remaining - hop_panel_h),
+    )
+
 
 class MonitorUI:
     """Adaptive Rich-based UI for network monitoring."""
 
-    def __init__(self, console: Console, data_provider: StatsDataProvider) -> None:
+    def __init__(
+        self,
+        console: Console,
+        data_provider: StatsDataProvider,
+        *,
+        min_frame_interval: float = MIN_FRAME_INTERVAL,
+    ) -> None:
         self.console = console
         self._data_provider = data_provider
+        self._min_frame_interval = min_frame_interval
+        self._last_layout: Layout | None = None
+        self._last_layout_size: ConsoleDimensions | None = None
+        self._last_layout_ts = 0.0
+        self._last_snap_version: int | None = None
+        self._now_utc = datetime.now(timezone.utc)
+        self._hop_row_cache: OrderedDict[tuple[Any, ...], tuple[Text, ...]] = OrderedDict()
+        # panel name -> (key of the inputs it was rendered from, panel). Keys hold the
+        # exact width: panels are sized to it, so a bucketed key would reuse panels
+        # that are a few cells too wide or narrow after a resize.
+        self._panel_cache: dict[str, tuple[tuple[Any, ...], Panel | None]] = {}
+        # panel name -> monotonic time before which a throttled panel is reused
+        self._panel_next_rebuild: dict[str, float] = {}
+        # (body stacked, has body, has toast) -> named nodes of the reusable layout tree;
+        # sizes are assigned per frame, so the tree itself survives resizes.
+        self._layout_trees: dict[tuple[bool, bool, bool], dict[str, Layout]] = {}
 
     @property
     def data_provider(self) -> StatsDataProvider:
         return self._data_provider
 
-    def _get_tier(self) -> LayoutTier:
-        width = self.console.size.width
+    def begin_frame(self) -> StatsSnapshot:
+        """Take the single stats snapshot shared by every panel of this frame."""
+        snap = self._data_provider.get_stats_snapshot()
+        self._now_utc = datetime.now(timezone.utc)
+        return snap
+
+    def _cached_panel(
+        self, name: str, key: tuple[Any, ...], build: Callable[[], _PanelT]
+    ) -> _PanelT:
+        """Return the panel rendered for *key* last time, or build and remember a new one.
+
+        The result has the type *build* returns, so only the optional toast is ``None``.
+        """
+        cached = self._panel_cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]  # type: ignore[return-value]
+        panel = build()
+        self._panel_cache[name] = (key, panel)
+        return panel
+
+    @staticmethod
+    def _get_tier(width: int) -> LayoutTier:
         if width < UI_COMPACT_THRESHOLD:
             return "compact"
         if width >= UI_WIDE_THRESHOLD:
             return "wide"
         return "standard"
 
-    def _get_height_tier(self) -> HeightTier:
-        height = self.console.size.height
+    @staticmethod
+    def _get_height_tier(height: int) -> HeightTier:
         if height < 25:
             return "minimal"
         if height < 32:
@@ -51,88 +167,198 @@ class MonitorUI:
             return "standard"
         return "full"
 
-    def generate_layout(self) -> Layout:
-        width = max(60, self.console.size.width)
-        height = max(20, self.console.size.height)
-        tier = self._get_tier()
-        h_tier = self._get_height_tier()
-        inner = width - 2
+    def _throttled_panel(
+        self,
+        name: str,
+        key: tuple[Any, ...],
+        build: Callable[[], Panel],
+        content: tuple[Any, ...] | None = None,
+    ) -> Panel:
+        """Like :meth:`_cached_panel`, but also reuse the panel until its refresh interval elapses.
 
-        snap = self._data_provider.get_stats_snapshot()
-        layout = Layout(name="root")
-
-        header_panel = render_header(snap, width, tier)
-        toast_panel = render_toast(snap, width)
-        dashboard_panel = render_dashboard(snap, width, tier)
-        footer_panel = render_footer(snap, width, tier)
-
-        connection_lost = bool(snap.get("threshold_states", {}).get("connection_lost", False))
-        hops = snap.get("hop_monitor_hops", [])
-        if connection_lost:
-            hops = []
-
-        if h_tier == "minimal":
-            hop_display_count = min(len(hops), 5)
-        elif h_tier == "short":
-            hop_display_count = min(len(hops), 8)
-        else:
-            hop_display_count = len(hops)
-
-        header_h = 3 if tier == "compact" else 4
-        dashboard_h = 3 if tier == "compact" else 4
-        toast_h = 3 if toast_panel else 0
-        footer_h = 3
-        fixed_lines = header_h + dashboard_h + footer_h + toast_h
-        remaining = height - fixed_lines
-
-        hop_panel_h = hop_display_count + 5 if hops else 4
-        hop_panel_h = min(hop_panel_h, max(4, remaining * 2 // 3))
-        body_h = max(8, remaining - hop_panel_h)
-        hop_panel = render_hop_panel(snap, width, tier, h_tier)
-
-        splits = [Layout(header_panel, size=header_h, name="header")]
-        if toast_panel:
-            splits.append(Layout(toast_panel, size=toast_h, name="toast"))
-        splits.append(Layout(dashboard_panel, size=dashboard_h, name="dashboard"))
-
-        if tier == "compact":
-            metrics_panel = render_metrics_panel(snap, width, tier, h_tier)
-            analysis_panel = render_analysis_panel(snap, width, tier, h_tier)
-
-            if h_tier == "minimal":
-                splits.append(Layout(hop_panel, name="hops", ratio=1))
-                splits.append(Layout(footer_panel, size=footer_h, name="footer"))
-                layout.split_column(*splits)
-            else:
-                body = Layout(name="body_inner")
-                body.split_column(
-                    Layout(metrics_panel, name="metrics", ratio=1),
-                    Layout(analysis_panel, name="analysis", ratio=1),
-                )
-                splits.append(Layout(name="body", size=body_h))
-                splits.append(Layout(hop_panel, name="hops", size=hop_panel_h))
-                splits.append(Layout(footer_panel, size=footer_h, name="footer"))
-                layout.split_column(*splits)
-                layout["body"].update(body)
-        else:
-            left_w = (inner // 2) - 1
-            right_w = inner - left_w - 1
-            metrics_panel = render_metrics_panel(snap, left_w, tier, h_tier)
-            analysis_panel = render_analysis_panel(snap, right_w, tier, h_tier)
-
-            body = Layout(name="body_inner")
-            body.split_row(
-                Layout(metrics_panel, name="metrics", ratio=1),
-                Layout(analysis_panel, name="analysis", ratio=1),
-            )
+        *key* should hold only the layout inputs (size, tier, connection state);
+        data changes are picked up on the next rebuild. *content* optionally
+        fingerprints the data the panel shows: while it is unchanged the panel is
+        reused even after the interval has elapsed.
+        """
+        now = time.monotonic()
+        cached = self._panel_cache.get(name)
+        if cached is not None:
+            cached_key, cached_content = cached[0]
+            if cached_key == key and (
+                now < self._panel_next_rebuild.get(name, 0.0)
+                or (content is not None and content == cached_content)
+            ):
+                return cached[1]  # type: ignore[return-value]
+        panel = build()
+        self._panel_cache[name] = ((key, content), panel)
+        self._panel_next_rebuild[name] = now + PANEL_REFRESH_INTERVALS[name]
+        return panel
 
-            splits.append(Layout(name="body", size=body_h))
-            splits.append(Layout(hop_panel, name="hops", size=hop_panel_h))
-            splits.append(Layout(footer_panel, size=footer_h, name="footer"))
-            layout.split_column(*splits)
-            layout["body"].update(body)
+    def generate_layout(self, *, force: bool = False) -> Layout:
+        """Return the layout for the current frame.
 
+        A request within the minimum frame interval of the previous one, at the
+        same terminal size, gets the previous layout back unless *force* is set.
+        So does one whose snapshot version is unchanged, until
+        ``UNCHANGED_FRAME_HEARTBEAT`` has passed.
+        """
+        size = self.console.size
+        now = time.monotonic()
+        reusable = not force and self._last_layout is not None and size == self._last_layout_size
+        if reusable and now - self._last_layout_ts < self._min_frame_interval:
+            return self._last_layout  # type: ignore[return-value]
+        snap = self.begin_frame()
+        version = snap["version"]
+        if (
+            reusable
+            and version == self._last_snap_version
+            and now - self._last_layout_ts < UNCHANGED_FRAME_HEARTBEAT
+        ):
+            return self._last_layout  # type: ignore[return-value]
+        layout = self._build_layout(size, snap)
+        self._last_layout = layout
+        self._last_layout_size = size
+        self._last_layout_ts = now
+        self._last_snap_version = version
         return layout
 
+    def _layout_nodes(self, stacked: bool, with_body: bool, with_toast: bool) -> dict[str, Layout]:
+        """Return the named nodes of the layout tree for this arrangement, built once.
+
+        *stacked* puts metrics above analysis (compact tier) instead of side by
+        side; the standard and wide tiers share one tree. Frames only swap panels
+        and sizes into the cached nodes.
+        """
+        key = (stacked, with_body, with_toast)
+        nodes = self._layout_trees.get(key)
+        if nodes is not None:
+            return nodes
+        names = ["header"]
+        if with_toast:
+            names.append("toast")
+        names.append("dashboard")
+        if with_body:
+            names.append("body")
+        names += ["hops", "footer"]
+        nodes = {name: Layout(name=name) for name in names}
+        root = Layout(name="root")
+        root.split_column(*(nodes[name] for name in names))
+        nodes["root"] = root
+        if with_body:
+            nodes["metrics"] = Layout(name="metrics", ratio=1)
+            nodes["analysis"] = Layout(name="analysis", ratio=1)
+            split = nodes["body"].split_column if stacked else nodes["body"].split_row
+            split(nodes["metrics"], nodes["analysis"])
+        self._layout_trees[key] = nodes
+        return nodes
+
+    def _build_layout(self, size: ConsoleDimensions, snap: StatsSnapshot) -> Layout:
+        # *size* is read once per frame by generate_layout; the console is not
+        # asked again while the frame is built.
+        width = max(60, size.width)
+        height = max(20, size.height)
+        tier = self._get_tier(size.width)
+        h_tier = self._get_height_tier(size.height)
+        is_compact = tier == "compact"
+        inner = width - 2
+
+        now_utc = self._now_utc
+        connection_lost = bool(snap["threshold_states"]["connection_lost"])
+        latest_version = snap["latest_version"]
+        header_panel = self._cached_panel(
+            "header",
+            (
+                width, tier, now_utc.replace(microsecond=0), connection_lost, latest_version,
+                snap["version_up_to_date"], snap["public_ip"], snap["country"], snap["country_code"],
+            ),
+            lambda: render_header(
+                snap, width, tier, now_utc=now_utc, connection_lost=connection_lost
+            ),
+        )
+        alerts = snap["active_alerts"]
+        toast_panel = self._cached_panel(
+            "toast",
+            (width, tuple((alert.get("type"), alert.get("message")) for alert in alerts)),
+            lambda: render_toast(snap, width),
+        )
+        # Ping results change only together with the ping total; the uptime text is
+        # the only other per-second input.
+        total = snap["total"]
+        dashboard_panel = self._cached_panel(
+            "dashboard",
+            (width, tier, total, connection_lost, fmt_uptime(snap["start_time"], now_utc)),
+            lambda: render_dashboard(
+                snap, width, tier, now_utc=now_utc, connection_lost=connection_lost
+            ),
+        )
+        footer_panel = self._cached_panel(
+            "footer", (width, tier, latest_version), lambda: render_footer(snap, width, tier)
+        )
+
+        len_hops = 0 if connection_lost else len(snap["hop_monitor_columns"]["hop"])
+        geom = _layout_geometry(height, is_compact, h_tier, len_hops, toast_panel is not None)
+        hop_panel = self._throttled_panel(
+            "hops",
+            (width, tier, h_tier, connection_lost),
+            lambda: render_hop_panel(
+                snap, width, tier, h_tier,
+                max_hops=geom.max_hops, row_cache=self._hop_row_cache,
+                connection_lost=connection_lost,
+            ),
+            # The repository rebuilds the columns object only when hop data arrives.
+            content=(snap["hop_monitor_discovering"], snap["hop_monitor_columns"]),
+        )
+
+        # Compact terminals that are also very short drop the metrics/analysis body.
+        with_body = not (is_compact and h_tier == "minimal")
+        nodes = self._layout_nodes(is_compact, with_body, toast_panel is not None)
+        nodes["header"].size = geom.header_h
+        nodes["header"].update(header_panel)
+        if toast_panel is not None:
+            nodes["toast"].size = geom.toast_h
+            nodes["toast"].update(toast_panel)
+        nodes["dashboard"].size = geom.dashboard_h
+        nodes["dashboard"].update(dashboard_panel)
+        nodes["footer"].size = geom.footer_h
+        nodes["footer"].update(footer_panel)
+        nodes["hops"].update(hop_panel)
+
+        if not with_body:
+            nodes["hops"].size = None
+            return nodes["root"]
+
+        nodes["hops"].size = geom.hop_panel_h
+        nodes["body"].size = geom.body_h
+        if is_compact:
+            panel_w = analysis_w = width
+        else:
+            panel_w = (inner // 2) - 1
+            analysis_w = inner - panel_w - 1
+        nodes["metrics"].update(
+            self._cached_panel(
+                "metrics",
+                (
+                    panel_w, tier, h_tier, total, connection_lost,
+                    snap["app_bytes_sent"], snap["app_bytes_recv"],
+                    snap["system_bytes_sent"], snap["system_bytes_recv"],
+                ),
+                lambda: render_metrics_panel(
+                    snap, panel_w, tier, h_tier, connection_lost=connection_lost
+                ),
+            )
+        )
+        nodes["analysis"].update(
+            self._throttled_panel(
+                "analysis",
+                (analysis_w, tier, h_tier, connection_lost),
+                lambda: render_analysis_panel(
+                    snap, analysis_w, tier, h_tier, now_utc=now_utc, connection_lost=connection_lost
+                ),
+                content=analysis_content(snap, now_utc),
+            )
+        )
+        return nodes["root"]
+
 
 __all__ = ["MonitorUI"]
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections import deque
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Any
+from functools import cache, lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Sequence
 
-from rich.table import Table
-from rich.text import Text
+from rich.table import Column, Table
+from rich.text import Span, Text
 
 from ui.theme import (
     ACCENT,
@@ -25,9 +29,13 @@ from ui.theme import (
 )
 
 try:
-    from config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN, ensure_utc, t
+    from config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN, ensure_utc
+    from config import t as _translate
+    from stats_repository import median_p95_sorted
 except ImportError:
-    from ..config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN, ensure_utc, t  # type: ignore[no-redef]
+    from ..config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN, ensure_utc  # type: ignore[no-redef]
+    from ..config import t as _translate  # type: ignore[no-redef]
+    from ..stats_repository import median_p95_sorted  # type: ignore[no-redef]
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
@@ -42,48 +50,128 @@ MID_DOT = "\u00b7"
 SLIM_BAR_FULL = "\u2501"
 SLIM_BAR_EMPTY = "\u2500"
 MAX_STATUS_GAUGE_WIDTH = 28
+# Dim placeholder markup for a missing value, shared by the panels.
+DIM_DASH = f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
+# Empty spacer line between panel sections; shared, so never append to it.
+BLANK_LINE = Text("")
 
 # Sparkline color thresholds
 SPARKLINE_LOW_THRESHOLD = 0.4
 SPARKLINE_HIGH_THRESHOLD = 0.7
 
+# Green/yellow/red color ladders: bisecting a value into its sorted thresholds
+# gives the index into _LEVEL_COLORS.
+_LEVEL_COLORS = (GREEN, YELLOW, RED)
+_LATENCY_THRESHOLDS = (HOP_LATENCY_GOOD, HOP_LATENCY_WARN)  # upper bounds, inclusive
+_RESPONSE_MS_THRESHOLDS = (50, 150)  # lower bounds of yellow and red
+_LOSS_PCT_THRESHOLDS = (1, 5)  # lower bounds of yellow and red
+
+# Pre-rendered sparkline cells indexed as [color bucket][glyph index];
+# buckets are green/yellow/red, and the bold table is used for the newest point.
+_SPARK_LUT: tuple[tuple[str, ...], ...] = tuple(
+    tuple(f"[{color}]{char}[/{color}]" for char in SPARK_CHARS) for color in (GREEN, YELLOW, RED)
+)
+_SPARK_LUT_LAST: tuple[tuple[str, ...], ...] = tuple(
+    tuple(f"[bold {color}]{char}[/bold {color}]" for char in SPARK_CHARS) for color in (GREEN, YELLOW, RED)
+)
+# sparkline_double splits 16 levels over two rows: (top, bottom) glyphs per level,
+# pre-rendered per color bucket like the single-row tables.
+_DOUBLE_GLYPHS = tuple((" ", char) for char in SPARK_CHARS) + tuple((char, SPARK_CHARS[-1]) for char in SPARK_CHARS)
+_SPARK_DOUBLE_LUT: tuple[tuple[tuple[str, str], ...], ...] = tuple(
+    tuple((f"[{color}]{top}[/{color}]", f"[{color}]{bottom}[/{color}]") for top, bottom in _DOUBLE_GLYPHS)
+    for color in (GREEN, YELLOW, RED)
+)
+_SPARK_DOUBLE_LUT_LAST: tuple[tuple[tuple[str, str], ...], ...] = tuple(
+    tuple((f"[bold {color}]{top}[/bold {color}]", f"[bold {color}]{bottom}[/bold {color}]") for top, bottom in _DOUBLE_GLYPHS)
+    for color in (GREEN, YELLOW, RED)
+)
+# Six glyph levels (blank plus the five lowest bars) for sparkline_mini.
+_MINI_SPARK_CHARS = " " + SPARK_CHARS[:5]
+
+
+@cache
+def t(key: str) -> str:
+    """Translate *key*, memoized for the render loop (keys are a small fixed set)."""
+    return _translate(key)
+
+
+@cache
+def dim_label(key: str) -> Text:
+    """Return the translated *key* as a dim ``Text``, built once per process.
+
+    The result is shared; combine it with ``Text.assemble`` rather than mutating it.
+    """
+    return Text(t(key), style=TEXT_DIM)
+
+
+@cache
+def key_label(key: str) -> str:
+    """Return the translated *key* followed by a colon, as used in key/value rows."""
+    return f"{t(key)}:"
+
 
 def _status_gauge_width(width: int) -> int:
     """Clamp status gauge width for a cleaner terminal layout."""
     return max(1, min(width, MAX_STATUS_GAUGE_WIDTH))
 
 
-def fmt_uptime(start_time: datetime | None) -> str:
-    """Format duration since *start_time* as a human-readable string."""
+def fmt_uptime(start_time: datetime | None, now: datetime | None = None) -> str:
+    """Format duration since *start_time* as a human-readable string.
+
+    *now* is the frame's UTC reference time; the current time is used when omitted.
+    """
     if start_time is None:
         return t("na")
     start_time = ensure_utc(start_time)
     if start_time is None:
         return t("na")
-    total = int((datetime.now(timezone.utc) - start_time).total_seconds())
-    d = total // 86400
-    h = (total % 86400) // 3600
-    m = (total % 3600) // 60
-    s = total % 60
-    parts: list[str] = []
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return _fmt_duration(int((now - start_time).total_seconds()))
+
+
+@lru_cache(maxsize=4)
+def _fmt_duration(total: int) -> str:
+    """Format *total* seconds as ``1d 2h 3m 4s``, dropping leading zero units.
+
+    Memoized because the UI redraws several times within the same second.
+    """
+    d, rem = divmod(total, 86400)
+    h, rem = divmod(rem, 3600)
+    m, s = divmod(rem, 60)
+    sec = f"{s}{t('time_s')}"
     if d:
-        parts.append(f"{d}{t('time_d')}")
-    if h or d:
-        parts.append(f"{h}{t('time_h')}")
-    if m or h or d:
-        parts.append(f"{m}{t('time_m')}")
-    parts.append(f"{s}{t('time_s')}")
-    return " ".join(parts)
+        return " ".join((f"{d}{t('time_d')}", f"{h}{t('time_h')}", f"{m}{t('time_m')}", sec))
+    if h:
+        return " ".join((f"{h}{t('time_h')}", f"{m}{t('time_m')}", sec))
+    if m:
+        return " ".join((f"{m}{t('time_m')}", sec))
+    return sec
 
 
-def fmt_since(ts: datetime | None) -> str:
-    """Format a relative time-ago string from *ts*."""
+def fmt_since(ts: datetime | None, now: datetime | None = None) -> str:
+    """Format a relative time-ago string from *ts*.
+
+    *now* is the frame's UTC reference time; the current time is used when omitted.
+    """
     if ts is None:
         return t("never")
     ts = ensure_utc(ts)
     if ts is None:
         return t("never")
-    sec = int((datetime.now(timezone.utc) - ts).total_seconds())
+    if now is None:
+        now = datetime.now(timezone.utc)
+    sec = int((now - ts).total_seconds())
+    # Past the first minute the text only changes once a minute.
+    return _fmt_ago(sec if sec < 60 else sec - sec % 60)
+
+
+@lru_cache(maxsize=16)
+def _fmt_ago(sec: int) -> str:
+    """Format *sec* seconds as a time-ago string; see :func:`fmt_since`.
+
+    Memoized because the same few timestamps are formatted on every redraw.
+    """
     if sec < 5:
         return t("just_now")
     if sec < 60:
@@ -116,64 +204,104 @@ def progress_bar(pct: float, width: int = 20, color: str = GREEN) -> str:
     """Render a slim Rich-markup progress bar."""
     width = _status_gauge_width(width)
     pct = max(0.0, min(pct, 100.0))
-    filled = int(round(pct / 100.0 * width))
+    return _progress_bar_cached(int(round(pct / 100.0 * width)), width, color)
+
+
+@lru_cache(maxsize=256)
+def _progress_bar_cached(filled: int, width: int, color: str) -> str:
+    """Markup for a bar with *filled* of *width* cells; few distinct inputs occur."""
     empty = width - filled
     return f"[{color}]{SLIM_BAR_FULL * filled}[/{color}][{ACCENT_DIM}]{SLIM_BAR_EMPTY * empty}[/{ACCENT_DIM}]"
 
 
-def sparkline(values: list[float], width: int = 40) -> str:
-    """Render a color-coded Unicode sparkline from *values*."""
+def _sparkline_rels(
+    values: Sequence[float] | deque[float], width: int, bounds: tuple[float, float] | None
+) -> list[float] | str:
+    """Relative heights (0..1) of the last *width* of *values*; see :func:`sparkline`.
+
+    Returns the translation key of the placeholder to show instead when there
+    is not enough data.
+    """
     if not values:
-        return f"[{TEXT_DIM}]{t('no_data')}[/{TEXT_DIM}]"
-    data = values[-width:]
+        return "no_data"
+    if isinstance(values, deque):
+        data: Sequence[float] = tuple(islice(values, max(0, len(values) - width), None))
+    else:
+        data = values[-width:]
     if len(data) < 2:
-        return f"[{TEXT_DIM}]{t('waiting')}[/{TEXT_DIM}]"
-
-    valid_data = [v for v in data if v > 0]
-    if not valid_data:
-        return f"[{TEXT_DIM}]{t('waiting')}[/{TEXT_DIM}]"
+        return "waiting"
 
-    mn, mx = min(valid_data), max(valid_data)
+    if bounds is not None:
+        mn, mx = bounds
+    else:
+        valid_data = [v for v in data if v > 0]
+        if not valid_data:
+            return "waiting"
+        mn, mx = min(valid_data), max(valid_data)
     rng = mx - mn if mx != mn else 1.0
-    chars: list[str] = []
-
-    for idx, value in enumerate(data):
-        if value == 0:
-            spark_idx = 0
-        else:
-            spark_idx = int((value - mn) / rng * (len(SPARK_CHARS) - 1))
-        spark_idx = max(0, min(spark_idx, len(SPARK_CHARS) - 1))
-
-        rel = (value - mn) / rng if value > 0 else 0.0
-        if rel < SPARKLINE_LOW_THRESHOLD:
-            color = GREEN
-        elif rel < SPARKLINE_HIGH_THRESHOLD:
-            color = YELLOW
-        else:
-            color = RED
-
-        char = SPARK_CHARS[spark_idx]
-        if idx == len(data) - 1:
-            chars.append(f"[bold {color}]{char}[/bold {color}]")
-        else:
-            chars.append(f"[{color}]{char}[/{color}]")
-
+    # Non-positive samples (timeouts) sit at the bottom in green.
+    return [(value - mn) / rng if value > 0 else 0.0 for value in data]
+
+
+def sparkline(
+    values: Sequence[float] | deque[float], width: int = 40, bounds: tuple[float, float] | None = None
+) -> str:
+    """Render a color-coded Unicode sparkline from the last *width* of *values*.
+
+    Only the visible tail is read, so long histories (including deques) are not copied.
+
+    *bounds* is an optional precomputed ``(min, max)`` of the positive values in
+    ``values[-width:]``; it saves the scan when the producer already knows it.
+    """
+    rels = _sparkline_rels(values, width, bounds)
+    if isinstance(rels, str):
+        return f"[{TEXT_DIM}]{t(rels)}[/{TEXT_DIM}]"
+    top = len(SPARK_CHARS) - 1
+    low, high = SPARKLINE_LOW_THRESHOLD, SPARKLINE_HIGH_THRESHOLD
+
+    # Each point maps straight to its pre-rendered (color, glyph) cell.
+    lut = _SPARK_LUT
+    chars = [lut[0 if rel < low else (1 if rel < high else 2)][min(int(rel * top), top)] for rel in rels]
+    rel = rels[-1]
+    chars[-1] = _SPARK_LUT_LAST[0 if rel < low else (1 if rel < high else 2)][min(int(rel * top), top)]
     return "".join(chars)
 
 
-def sparkline_mini(history: list[float]) -> str:
+def sparkline_text(
+    values: Sequence[float] | deque[float], width: int = 40, bounds: tuple[float, float] | None = None
+) -> Text:
+    """Like :func:`sparkline`, but build the ``Text`` directly instead of markup.
+
+    Runs of one color become a single span, so nothing has to be parsed.
+    """
+    rels = _sparkline_rels(values, width, bounds)
+    if isinstance(rels, str):
+        return Text(t(rels), style=TEXT_DIM)
+    top = len(SPARK_CHARS) - 1
+    low, high = SPARKLINE_LOW_THRESHOLD, SPARKLINE_HIGH_THRESHOLD
+
+    chars = "".join([SPARK_CHARS[min(int(rel * top), top)] for rel in rels])
+    buckets = [0 if rel < low else (1 if rel < high else 2) for rel in rels]
+    last = len(buckets) - 1
+    spans: list[Span] = []
+    start = 0
+    for idx in range(1, last + 1):
+        if buckets[idx] != buckets[start] or idx == last:
+            spans.append(Span(start, idx, _LEVEL_COLORS[buckets[start]]))
+            start = idx
+    spans.append(Span(last, last + 1, f"bold {_LEVEL_COLORS[buckets[last]]}"))
+    return Text(chars, spans=spans)
+
+
+def sparkline_mini(history: Sequence[float]) -> str:
     """Render a tiny, six-point history sparkline."""
     if not history or len(history) < 2:
         return ""
     data = history[-6:]
     mn, mx = min(data), max(data)
     rng = mx - mn if mx != mn else 1.0
-    chars = " " + SPARK_CHARS[:5]
-    out: list[str] = []
-    for value in data:
-        spark_idx = min(5, int((value - mn) / rng * 5))
-        out.append(chars[spark_idx])
-    return "".join(out)
+    chars = _MINI_SPARK_CHARS
+    return "".join([chars[min(5, int((value - mn) / rng * 5))] for value in data])
 
 
 def sparkline_double(values: list[float], width: int = 40) -> tuple[str, str]:
@@ -193,31 +321,18 @@ def sparkline_double(values: list[float], width: int = 40) -> tuple[str, str]:
 
     mn, mx = min(valid_data), max(valid_data)
     rng = mx - mn if mx != mn else 1.0
+    low, high = SPARKLINE_LOW_THRESHOLD, SPARKLINE_HIGH_THRESHOLD
+    last = len(data) - 1
     top_chars: list[str] = []
     bottom_chars: list[str] = []
 
     for idx, value in enumerate(data):
-        level = 0 if value == 0 else int((value - mn) / rng * 15)
-        level = max(0, min(level, 15))
-
+        level = 0 if value == 0 else max(0, min(int((value - mn) / rng * 15), 15))
         rel = (value - mn) / rng if value > 0 else 0.0
-        if rel < SPARKLINE_LOW_THRESHOLD:
-            color = GREEN
-        elif rel < SPARKLINE_HIGH_THRESHOLD:
-            color = YELLOW
-        else:
-            color = RED
-
-        if level <= 7:
-            top = " "
-            bottom = SPARK_CHARS[level]
-        else:
-            top = SPARK_CHARS[level - 8]
-            bottom = SPARK_CHARS[-1]
-
-        style = f"bold {color}" if idx == len(data) - 1 else color
-        top_chars.append(f"[{style}]{top}[/{style}]")
-        bottom_chars.append(f"[{style}]{bottom}[/{style}]")
+        lut = _SPARK_DOUBLE_LUT_LAST if idx == last else _SPARK_DOUBLE_LUT
+        top, bottom = lut[0 if rel < low else (1 if rel < high else 2)][level]
+        top_chars.append(top)
+        bottom_chars.append(bottom)
 
     return ("".join(top_chars), "".join(bottom_chars))
 
@@ -227,7 +342,6 @@ def mini_gauge(value: float, max_val: float = 100.0, width: int = 10, color: str
     width = _status_gauge_width(width)
     pct = max(0.0, min(value / max_val, 1.0))
     filled = int(round(pct * width))
-    empty = width - filled
 
     if pct >= 0.95:
         icon = "\u25c9"
@@ -236,7 +350,7 @@ def mini_gauge(value: float, max_val: float = 100.0, width: int = 10, color: str
     else:
         icon = "\u25cc"
 
-    bar = f"[{color}]{SLIM_BAR_FULL * filled}[/{color}][{ACCENT_DIM}]{SLIM_BAR_EMPTY * empty}[/{ACCENT_DIM}]"
+    bar = _progress_bar_cached(filled, width, color)
     return f"[{color}]{icon}[/{color}] [{color}]{value:.1f}%[/{color}] {bar}"
 
 
@@ -246,33 +360,48 @@ def dns_mini_bar(ms: float | None, max_ms: float = 200.0, width: int = 6) -> str
     if ms is None:
         return f"[{TEXT_DIM}]{SLIM_BAR_EMPTY * width}[/{TEXT_DIM}]"
     pct = max(0.0, min(ms / max_ms, 1.0))
-    filled = int(round(pct * width))
-    empty = width - filled
-    color = GREEN if ms < 50 else (YELLOW if ms < 150 else RED)
-    return f"[{color}]{SLIM_BAR_FULL * filled}[/{color}][{ACCENT_DIM}]{SLIM_BAR_EMPTY * empty}[/{ACCENT_DIM}]"
+    return _progress_bar_cached(int(round(pct * width)), width, response_ms_color(ms))
+
+
+@lru_cache(maxsize=32)
+def _kv_columns(width: int, key_width: int) -> tuple[Column, ...]:
+    """Column prototypes for :func:`kv_table`; copy before attaching to a table."""
+    return (
+        Column("k", style=TEXT_DIM, width=key_width, no_wrap=True),
+        Column("v", width=max(10, width - key_width - 3), no_wrap=True),
+    )
+
+
+@lru_cache(maxsize=32)
+def _dual_kv_columns(width: int) -> tuple[Column, ...]:
+    """Column prototypes for :func:`dual_kv_table`; copy before attaching to a table."""
+    col_w = max(8, (width - 6) // 4)
+    return (
+        Column("k1", style=TEXT_DIM, width=col_w, no_wrap=True),
+        Column("v1", width=col_w, no_wrap=True),
+        Column("k2", style=TEXT_DIM, width=col_w, no_wrap=True),
+        Column("v2", width=col_w, no_wrap=True),
+    )
 
 
 def kv_table(width: int, key_width: int = 14) -> Table:
     """Create a two-column key/value Rich table."""
-    tbl = Table(show_header=False, box=None, padding=(0, 1), width=width)
-    tbl.add_column("k", style=TEXT_DIM, width=key_width, no_wrap=True)
-    tbl.add_column("v", width=max(10, width - key_width - 3), no_wrap=True)
-    return tbl
+    columns = [col.copy() for col in _kv_columns(width, key_width)]
+    return Table(*columns, show_header=False, box=None, padding=(0, 1), width=width)
 
 
 def dual_kv_table(width: int) -> Table:
     """Create a four-column dual key/value Rich table."""
-    tbl = Table(show_header=False, box=None, padding=(0, 1), width=width)
-    col_w = max(8, (width - 6) // 4)
-    tbl.add_column("k1", style=TEXT_DIM, width=col_w, no_wrap=True)
-    tbl.add_column("v1", width=col_w, no_wrap=True)
-    tbl.add_column("k2", style=TEXT_DIM, width=col_w, no_wrap=True)
-    tbl.add_column("v2", width=col_w, no_wrap=True)
-    return tbl
+    columns = [col.copy() for col in _dual_kv_columns(width)]
+    return Table(*columns, show_header=False, box=None, padding=(0, 1), width=width)
 
 
+@lru_cache(maxsize=64)
 def section_header(label: str, width: int) -> Text:
-    """Render a quiet premium section divider."""
+    """Render a quiet premium section divider.
+
+    Built once per ``(label, width)``; the result is shared, so do not mutate it.
+    """
     text = Text()
     text.append("  ")
     text.append(label.upper(), style=f"bold {WHITE}")
@@ -283,6 +412,15 @@ def section_header(label: str, width: int) -> Text:
     return text
 
 
+@lru_cache(maxsize=512)
+def markup_text(markup: str) -> Text:
+    """Parse *markup* into ``Text`` once; repeated cells reuse the parsed result.
+
+    The result is shared, so do not mutate it.
+    """
+    return Text.from_markup(markup)
+
+
 def truncate(text: str, max_len: int) -> str:
     """Truncate text with ellipsis if it exceeds *max_len*."""
     if len(text) <= max_len:
@@ -305,22 +443,52 @@ def lat_color(val: float | None) -> str:
     """Return a color string based on latency thresholds."""
     if val is None:
         return RED
-    if val > HOP_LATENCY_WARN:
-        return RED
-    if val > HOP_LATENCY_GOOD:
-        return YELLOW
-    return GREEN
+    return _LEVEL_COLORS[bisect_left(_LATENCY_THRESHOLDS, val)]
+
+
+def response_ms_color(ms: float) -> str:
+    """Return the color for a DNS response time in milliseconds."""
+    return _LEVEL_COLORS[bisect_right(_RESPONSE_MS_THRESHOLDS, ms)]
+
+
+def loss_color(pct: float) -> str:
+    """Return the color for a packet loss percentage."""
+    return _LEVEL_COLORS[bisect_right(_LOSS_PCT_THRESHOLDS, pct)]
+
+
+def latency_median_p95(latencies: list[float]) -> tuple[float | None, float | None]:
+    """Return ``(median, p95)`` of *latencies*, or ``None`` for each when empty.
+
+    With fewer than 20 samples the maximum stands in for the 95th percentile.
+    """
+    # One sort serves both statistics; see median_p95_sorted.
+    return median_p95_sorted(sorted(latencies))
+
+
+def recent_loss_pct(recent: list[bool]) -> float:
+    """Return the packet loss percentage over the recent results window."""
+    return recent.count(False) / len(recent) * 100 if recent else 0.0
+
 
+def get_connection_state(
+    snap: StatsSnapshot, loss30: float | None = None, *, connection_lost: bool | None = None
+) -> tuple[str, str, str]:
+    """Return ``(label, color, icon)`` for the current connection state.
 
-def get_connection_state(snap: StatsSnapshot) -> tuple[str, str, str]:
-    """Return ``(label, color, icon)`` for the current connection state."""
-    if snap["threshold_states"]["connection_lost"]:
+    *loss30* defaults to the snapshot's ``loss_recent_pct``, which the repository
+    keeps from a running count; the window is only recounted when that is absent.
+    *connection_lost* is read from the snapshot's threshold states when omitted.
+    """
+    if connection_lost is None:
+        connection_lost = snap["threshold_states"]["connection_lost"]
+    if connection_lost:
         return t("status_disconnected"), RED, DOT_WARN
-    recent = snap["recent_results"]
-    if recent:
-        loss30 = recent.count(False) / len(recent) * 100
-        if loss30 > 5:
-            return t("status_degraded"), YELLOW, DOT_WARN
+    if loss30 is None:
+        loss30 = snap.get("loss_recent_pct")
+    if loss30 is None:
+        loss30 = recent_loss_pct(snap["recent_results"])
+    if loss30 > 5:
+        return t("status_degraded"), YELLOW, DOT_WARN
     if snap["last_status"] == t("status_timeout"):
         return t("status_timeout_bar"), RED, DOT_WARN
     if snap["last_status"] == t("status_ok"):
@@ -329,12 +497,18 @@ def get_connection_state(snap: StatsSnapshot) -> tuple[str, str, str]:
 
 
 __all__ = [
+    "DIM_DASH",
+    "BLANK_LINE",
+    "t",
+    "dim_label",
+    "key_label",
     "ensure_utc",
     "fmt_uptime",
     "fmt_since",
     "fmt_bytes",
     "progress_bar",
     "sparkline",
+    "sparkline_text",
     "sparkline_mini",
     "sparkline_double",
     "mini_gauge",
@@ -342,8 +516,13 @@ __all__ = [
     "kv_table",
     "dual_kv_table",
     "section_header",
+    "markup_text",
     "truncate",
     "render_trend_arrow",
     "lat_color",
+    "response_ms_color",
+    "loss_color",
+    "latency_median_p95",
+    "recent_loss_pct",
     "get_connection_state",
 ]
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import statistics
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rich import box
 from rich.console import Group
@@ -13,111 +12,185 @@ from rich.table import Table
 from rich.text import Text
 
 from ui.theme import ACCENT, ACCENT_DIM, BG_PANEL, GREEN, HeightTier, LayoutTier, RED, TEXT_DIM, WHITE, YELLOW
-from ui.helpers import dns_mini_bar, dual_kv_table, ensure_utc, fmt_since, mini_gauge, section_header, truncate
+from ui.helpers import (
+    BLANK_LINE,
+    DIM_DASH,
+    dim_label,
+    dns_mini_bar,
+    dual_kv_table,
+    ensure_utc,
+    fmt_since,
+    key_label,
+    markup_text,
+    mini_gauge,
+    response_ms_color,
+    section_header,
+    t,
+    truncate,
+)
 
 try:
-    from config import SHOW_VISUAL_ALERTS, t
+    from config import SHOW_VISUAL_ALERTS
 except ImportError:
-    from ...config import SHOW_VISUAL_ALERTS, t  # type: ignore[no-redef]
+    from ...config import SHOW_VISUAL_ALERTS  # type: ignore[no-redef]
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
 
 
-DEF_DASH = f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
+# Markup templates, built once so cells only substitute their values.
+_GREEN_CELL = f"[{GREEN}]{{}}[/{GREEN}]"
+_YELLOW_CELL = f"[{YELLOW}]{{}}[/{YELLOW}]"
+_RED_CELL = f"[{RED}]{{}}[/{RED}]"
+_WHITE_CELL = f"[{WHITE}]{{}}[/{WHITE}]"
+_DIM_CELL = f"[{TEXT_DIM}]{{}}[/{TEXT_DIM}]"
+_EMPTY_DNS_BAR = f"[{TEXT_DIM}]------[/{TEXT_DIM}]"
+_BENCH_CELL = "[{color}]{label}:{value}[/{color}]"
+_BENCH_AVG = f" [{TEXT_DIM}]/{{:.0f}}[/{TEXT_DIM}]"
+_TTL_HOPS = f" [{TEXT_DIM}]({{}} {{}})[/{TEXT_DIM}]"
+# Display order of DNS record types; any other configured types follow, sorted.
+_DNS_RECORD_ORDER: tuple[str, ...] = ("A", "AAAA", "NS", "MX", "CNAME", "TXT")
+_DNS_RECORD_SET = frozenset(_DNS_RECORD_ORDER)
+# DNS benchmark test types, as keyed in the snapshot's dns_benchmark, with their short labels.
+_BENCH_TYPES: tuple[tuple[str, str], ...] = (("cached", "C"), ("uncached", "U"), ("dotcom", "D"))
 
 
 def _problem_text(snap: StatsSnapshot, connection_lost: bool) -> tuple[str, str]:
-    problem_type = snap.get("current_problem_type", t("problem_none"))
+    problem_type = snap["current_problem_type"]
     if connection_lost:
         problem_type = t("problem_isp")
 
     if problem_type == t("problem_none"):
-        problem_markup = f"[{GREEN}]{problem_type}[/{GREEN}]"
+        problem_markup = _GREEN_CELL.format(problem_type)
     elif problem_type in (t("problem_isp"), t("problem_dns")):
-        problem_markup = f"[{RED}]{problem_type}[/{RED}]"
+        problem_markup = _RED_CELL.format(problem_type)
     elif problem_type in (t("problem_local"), t("problem_mtu")):
-        problem_markup = f"[{YELLOW}]{problem_type}[/{YELLOW}]"
+        problem_markup = _YELLOW_CELL.format(problem_type)
     else:
-        problem_markup = f"[{WHITE}]{problem_type}[/{WHITE}]"
+        problem_markup = _WHITE_CELL.format(problem_type)
 
-    prediction = snap.get("problem_prediction", t("prediction_stable"))
+    prediction = snap["problem_prediction"]
     if connection_lost:
         prediction = t("prediction_risk")
     if prediction == t("prediction_stable"):
-        prediction_markup = f"[{GREEN}]{prediction}[/{GREEN}]"
+        prediction_markup = _GREEN_CELL.format(prediction)
     else:
-        prediction_markup = f"[{YELLOW}]{prediction}[/{YELLOW}]"
+        prediction_markup = _YELLOW_CELL.format(prediction)
 
     return problem_markup, prediction_markup
 
 
-def _last_problem_markup(last_problem_time) -> str:
+def _last_problem_markup(last_problem_time: datetime | None, now_utc: datetime) -> str:
     if last_problem_time is None:
-        return f"[{GREEN}]{t('never')}[/{GREEN}]"
+        return _GREEN_CELL.format(t("never"))
     utc_ts = ensure_utc(last_problem_time)
     if utc_ts is None:
-        return f"[{GREEN}]{t('never')}[/{GREEN}]"
-    age = (datetime.now(timezone.utc) - utc_ts).total_seconds()
-    since_txt = fmt_since(last_problem_time)
+        return _GREEN_CELL.format(t("never"))
+    age = (now_utc - utc_ts).total_seconds()
+    since_txt = fmt_since(utc_ts, now_utc)
     if age < 60:
-        return f"[{RED}]{since_txt}[/{RED}]"
-    return f"[{YELLOW}]{since_txt}[/{YELLOW}]"
+        return _RED_CELL.format(since_txt)
+    return _YELLOW_CELL.format(since_txt)
+
+
+def analysis_content(snap: StatsSnapshot, now_utc: datetime) -> tuple[Any, ...]:
+    """Fingerprint of everything the analysis panel shows apart from its layout.
+
+    Relative times enter as their displayed text, so the panel only counts as
+    changed when one of them would read differently.
+    """
+    return (
+        snap["current_problem_type"], snap["problem_prediction"], snap["problem_pattern"],
+        _last_problem_markup(snap["last_problem_time"], now_utc),
+        len(snap["route_hops"]), snap["route_avg_latency"], snap["route_problematic_hop"],
+        snap["route_changed"], snap["route_last_diff_count"], snap["route_consecutive_changes"],
+        fmt_since(snap["route_last_change_time"], now_utc),
+        snap["dns_health"], snap["dns_results"], snap["dns_benchmark"],
+        snap["dns_resolve_time"], snap["dns_status"],
+        snap["last_ttl"], snap["ttl_hops"], snap["path_mtu"], snap["local_mtu"], snap["mtu_status"],
+        # A running traceroute hides the time since the last one.
+        True if snap["traceroute_running"] else fmt_since(snap["last_traceroute_time"], now_utc),
+    )
 
 
-def render_analysis_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_tier: HeightTier) -> Panel:
+def render_analysis_panel(
+    snap: StatsSnapshot,
+    width: int,
+    tier: LayoutTier,
+    h_tier: HeightTier,
+    *,
+    now_utc: datetime | None = None,
+    connection_lost: bool | None = None,
+) -> Panel:
     """Render a cleaner analysis and diagnostics panel."""
-    connection_lost = bool(snap.get("threshold_states", {}).get("connection_lost", False))
+    if now_utc is None:
+        now_utc = datetime.now(timezone.utc)
+    if connection_lost is None:
+        connection_lost = bool(snap["threshold_states"]["connection_lost"])
+    detailed = h_tier in ("standard", "full")
     inner_w = max(20, width - 4)
+    # DNS and network fields, read from the snapshot once up front.
+    dns_health = snap["dns_health"]
+    dns_results = snap["dns_results"]
+    dns_benchmark = snap["dns_benchmark"]
+    dns_time = snap["dns_resolve_time"]
+    dns_status = snap["dns_status"]
+    last_ttl = snap["last_ttl"]
+    ttl_hops = snap["ttl_hops"]
+    path_mtu = snap["path_mtu"]
+    local_mtu = snap["local_mtu"]
+    mtu_status = snap["mtu_status"]
+    traceroute_running = snap["traceroute_running"]
+    last_trace = snap["last_traceroute_time"]
     items: list[Table | Text] = []
 
     problem_markup, prediction_markup = _problem_text(snap, connection_lost)
-    last_problem_markup = _last_problem_markup(snap.get("last_problem_time"))
-    pattern = snap.get("problem_pattern", "...")
-    pattern_markup = f"[{WHITE}]{pattern}[/{WHITE}]" if pattern != "..." else DEF_DASH
+    last_problem_markup = _last_problem_markup(snap["last_problem_time"], now_utc)
+    pattern = snap["problem_pattern"]
+    pattern_markup = _WHITE_CELL.format(pattern) if pattern != "..." else DIM_DASH
 
     items.append(section_header(t("problem_analysis"), inner_w))
     summary = dual_kv_table(width)
-    summary.add_row(f"{t('problem_type')}:", problem_markup, f"{t('prediction')}:", prediction_markup)
-    summary.add_row(f"{t('last_problem')}:", last_problem_markup, f"{t('pattern')}:", pattern_markup)
+    summary.add_row(key_label("problem_type"), problem_markup, key_label("prediction"), prediction_markup)
+    summary.add_row(key_label("last_problem"), last_problem_markup, key_label("pattern"), pattern_markup)
     items.append(summary)
 
-    route_hops = snap.get("route_hops", []) if not connection_lost else []
-    hop_count = len(route_hops)
-    route_changed = bool(snap.get("route_changed", False)) if not connection_lost else False
-    route_state = f"[{YELLOW}]{t('route_changed')}[/{YELLOW}]" if route_changed else f"[{GREEN}]{t('route_stable')}[/{GREEN}]"
+    # Route data is stale while disconnected, so it is blanked out rather than shown.
     if connection_lost:
-        route_state = f"[{RED}]{t('status_disconnected')}[/{RED}]"
-    problematic_hop = snap.get("route_problematic_hop") if not connection_lost else None
-    problematic_markup = f"[{RED}]{problematic_hop}[/{RED}]" if problematic_hop else f"[{GREEN}]{t('none_label')}[/{GREEN}]"
-    avg_route_latency = None
-    if route_hops:
-        lat_values = [hop["avg_latency"] for hop in route_hops if hop.get("avg_latency") is not None]
-        if lat_values:
-            avg_route_latency = statistics.mean(lat_values)
-
-    items.append(Text(""))
+        hop_count = 0
+        avg_route_latency = None
+        problematic_hop = None
+        route_diff = route_cons = 0
+        route_last_change = None
+        route_state = _RED_CELL.format(t("status_disconnected"))
+    else:
+        hop_count = len(snap["route_hops"])
+        avg_route_latency = snap["route_avg_latency"]
+        problematic_hop = snap["route_problematic_hop"]
+        route_diff = snap["route_last_diff_count"]
+        route_cons = snap["route_consecutive_changes"]
+        route_last_change = snap["route_last_change_time"]
+        if snap["route_changed"]:
+            route_state = _YELLOW_CELL.format(t("route_changed"))
+        else:
+            route_state = _GREEN_CELL.format(t("route_stable"))
+    problematic_markup = _RED_CELL.format(problematic_hop) if problematic_hop else _GREEN_CELL.format(t("none_label"))
+
+    items.append(BLANK_LINE)
     items.append(section_header(t("route_analysis"), inner_w))
     route_tbl = dual_kv_table(width)
-    route_tbl.add_row(f"{t('route_label')}:", route_state, f"{t('hops_count')}:", f"[{WHITE}]{hop_count}[/{WHITE}]" if hop_count else DEF_DASH)
-    route_tbl.add_row(f"{t('problematic_hop_short')}:", problematic_markup, f"{t('avg_latency_short')}:", f"[{WHITE}]{avg_route_latency:.1f}[/{WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]" if avg_route_latency else DEF_DASH)
-    if h_tier in ("standard", "full"):
-        route_diff = snap.get("route_last_diff_count", 0) if not connection_lost else 0
-        route_cons = snap.get("route_consecutive_changes", 0) if not connection_lost else 0
-        route_last_change = snap.get("route_last_change_time") if not connection_lost else None
+    route_tbl.add_row(key_label("route_label"), route_state, key_label("hops_count"), _WHITE_CELL.format(hop_count) if hop_count else DIM_DASH)
+    route_tbl.add_row(key_label("problematic_hop_short"), problematic_markup, key_label("avg_latency_short"), f"[{WHITE}]{avg_route_latency:.1f}[/{WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]" if avg_route_latency else DIM_DASH)
+    if detailed:
         route_tbl.add_row(
-            f"{t('changed_hops')}:",
-            f"[{TEXT_DIM}]{route_diff} {t('hops_unit')}[/{TEXT_DIM}]" if route_diff else DEF_DASH,
-            f"{t('changes')}:",
-            f"[{TEXT_DIM}]{route_cons} / {fmt_since(route_last_change)}[/{TEXT_DIM}]" if route_cons else DEF_DASH,
+            key_label("changed_hops"),
+            f"[{TEXT_DIM}]{route_diff} {t('hops_unit')}[/{TEXT_DIM}]" if route_diff else DIM_DASH,
+            key_label("changes"),
+            f"[{TEXT_DIM}]{route_cons} / {fmt_since(route_last_change, now_utc)}[/{TEXT_DIM}]" if route_cons else DIM_DASH,
         )
     items.append(route_tbl)
 
-    dns_health = snap.get("dns_health", {})
-    dns_results = snap.get("dns_results", {})
-    dns_benchmark = snap.get("dns_benchmark", {})
-
-    items.append(Text(""))
+    items.append(BLANK_LINE)
     items.append(section_header(t("dns"), inner_w))
     if dns_health:
         score = float(dns_health.get("score", 0.0))
@@ -131,32 +204,29 @@ def render_analysis_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_t
         else:
             score_color = RED
 
-        items.append(Text.from_markup(
-            f"  [{TEXT_DIM}]{t('dns_score')}[/{TEXT_DIM}] {mini_gauge(score, max_val=100.0, width=max(6, width - 34), color=score_color)}"
+        items.append(Text.assemble(
+            "  ", dim_label("dns_score"), " ",
+            markup_text(mini_gauge(score, max_val=100.0, width=max(6, width - 34), color=score_color)),
         ))
+        dns_line = Text.assemble("  ", dim_label("dns_reliability_short"), " ", (f"{reliability:.0f}%", WHITE))
         if jitter is not None:
-            dns_line = (
-                f"  [{TEXT_DIM}]{t('dns_reliability_short')}[/{TEXT_DIM}] [{WHITE}]{reliability:.0f}%[/{WHITE}]  "
-                f"[{TEXT_DIM}]{t('dns_jitter_short')}[/{TEXT_DIM}] [{WHITE}]{jitter:.1f}[/{WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]"
-            )
-        else:
-            dns_line = f"  [{TEXT_DIM}]{t('dns_reliability_short')}[/{TEXT_DIM}] [{WHITE}]{reliability:.0f}%[/{WHITE}]"
-        items.append(Text.from_markup(dns_line))
-    elif snap.get("dns_resolve_time") is None:
-        fallback = f"[{RED}]{t('error')}[/{RED}]" if SHOW_VISUAL_ALERTS else f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
-        items.append(Text.from_markup(f"  {fallback}"))
+            dns_line.append_text(Text.assemble(
+                "  ", dim_label("dns_jitter_short"), " ", (f"{jitter:.1f}", WHITE), " ", dim_label("ms"),
+            ))
+        items.append(dns_line)
+    elif dns_time is None:
+        fallback = (t("error"), RED) if SHOW_VISUAL_ALERTS else ("-", TEXT_DIM)
+        items.append(Text.assemble("  ", fallback))
     else:
-        dns_time = snap.get("dns_resolve_time")
-        dns_status = snap.get("dns_status")
         if dns_status == t("ok"):
-            dns_markup = f"[{GREEN}]{t('ok_label')}[/{GREEN}]"
+            dns_cell = (t("ok_label"), GREEN)
         elif dns_status == t("slow"):
-            dns_markup = f"[{YELLOW}]{t('slow')}[/{YELLOW}]"
+            dns_cell = (t("slow"), YELLOW)
         else:
-            dns_markup = f"[{RED}]{t('error')}[/{RED}]"
-        items.append(Text.from_markup(f"  {dns_markup} [{TEXT_DIM}]({dns_time:.0f}{t('ms')})[/{TEXT_DIM}]"))
+            dns_cell = (t("error"), RED)
+        items.append(Text.assemble("  ", dns_cell, " ", (f"({dns_time:.0f}{t('ms')})", TEXT_DIM)))
 
-    if dns_results and h_tier in ("standard", "full"):
+    if dns_results and detailed:
         dns_tbl = Table(show_header=True, header_style=f"bold {WHITE}", box=None, padding=(0, 1), width=inner_w)
         dns_tbl.add_column(t("ui_type"), width=6, no_wrap=True)
         dns_tbl.add_column(t("ui_ok_short"), width=4, justify="center", no_wrap=True)
@@ -165,7 +235,15 @@ def render_analysis_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_t
         dns_tbl.add_column(t("ttl"), width=6, justify="right", no_wrap=True)
         dns_tbl.add_column(t("ui_value"), ratio=1, overflow="ellipsis")
 
-        for record_type in ("A", "AAAA", "NS", "MX", "CNAME", "TXT"):
+        yes_markup = _GREEN_CELL.format(t("ui_yes"))
+        no_markup = _RED_CELL.format(t("ui_no"))
+        checks_unit = t("checks_unit")
+        failed_label = t("failed")
+        record_types = _DNS_RECORD_ORDER
+        extra_types = dns_results.keys() - _DNS_RECORD_SET
+        if extra_types:
+            record_types += tuple(sorted(extra_types))
+        for record_type in record_types:
             result = dns_results.get(record_type)
             if not result:
                 continue
@@ -173,90 +251,87 @@ def render_analysis_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_t
             response_ms = result.get("response_time_ms")
             ttl_value = result.get("ttl")
             record_count = result.get("record_count", 0)
-            ok_markup = f"[{GREEN}]{t('ui_yes')}[/{GREEN}]" if success else f"[{RED}]{t('ui_no')}[/{RED}]"
+            ok_markup = yes_markup if success else no_markup
 
             if response_ms is not None:
-                ms_color = GREEN if response_ms < 50 else (YELLOW if response_ms < 150 else RED)
+                ms_color = response_ms_color(response_ms)
                 avg_markup = f"[{ms_color}]{response_ms:.0f}[/{ms_color}]"
                 bar_markup = dns_mini_bar(response_ms, max_ms=200.0, width=6)
             else:
-                avg_markup = DEF_DASH
-                bar_markup = f"[{TEXT_DIM}]------[/{TEXT_DIM}]"
+                avg_markup = DIM_DASH
+                bar_markup = _EMPTY_DNS_BAR
 
-            ttl_markup = f"[{TEXT_DIM}]{ttl_value}[/{TEXT_DIM}]" if ttl_value is not None else DEF_DASH
+            ttl_markup = _DIM_CELL.format(ttl_value) if ttl_value is not None else DIM_DASH
             if success and record_count > 0:
-                value_markup = f"[{TEXT_DIM}]{record_count} {t('checks_unit')}[/{TEXT_DIM}]"
+                value_markup = _DIM_CELL.format(f"{record_count} {checks_unit}")
             elif not success:
-                value_markup = f"[{RED}]{truncate(result.get('error', '') or t('failed'), 20)}[/{RED}]"
+                value_markup = _RED_CELL.format(truncate(result.get("error", "") or failed_label, 20))
             else:
-                value_markup = DEF_DASH
+                value_markup = DIM_DASH
 
             dns_tbl.add_row(record_type, ok_markup, avg_markup, bar_markup, ttl_markup, value_markup)
 
-        items.append(Text(""))
+        items.append(BLANK_LINE)
         items.append(dns_tbl)
 
     if dns_benchmark and h_tier == "full":
         benchmark_parts: list[str] = []
-        for record_type in ("A", "AAAA", "NS", "MX", "TXT"):
-            result = dns_benchmark.get(record_type, {})
+        status_ok, status_slow, status_failed = t("ok"), t("slow"), t("failed")
+        for test_type, label in _BENCH_TYPES:
+            result = dns_benchmark.get(test_type)
             if not result:
                 continue
             if not result.get("success"):
-                benchmark_parts.append(f"[{RED}]{record_type}:fail[/{RED}]")
+                benchmark_parts.append(_BENCH_CELL.format(color=RED, label=label, value="fail"))
                 continue
             response_ms = result.get("response_time_ms")
             avg_ms = result.get("avg_ms")
-            status = result.get("status", t("failed"))
-            color = GREEN if status == t("ok") else (YELLOW if status == t("slow") else RED)
-            cell = f"[{color}]{record_type}:{response_ms:.0f}[/{color}]" if response_ms is not None else f"[{color}]{record_type}:ok[/{color}]"
+            status = result.get("status", status_failed)
+            color = GREEN if status == status_ok else (YELLOW if status == status_slow else RED)
+            value = f"{response_ms:.0f}" if response_ms is not None else "ok"
+            cell = _BENCH_CELL.format(color=color, label=label, value=value)
             if avg_ms is not None:
-                cell += f" [{TEXT_DIM}]/{avg_ms:.0f}[/{TEXT_DIM}]"
+                cell += _BENCH_AVG.format(avg_ms)
             benchmark_parts.append(cell)
         if benchmark_parts:
-            items.append(Text(""))
-            items.append(Text.from_markup(
+            items.append(BLANK_LINE)
+            items.append(markup_text(
                 f"  [{ACCENT}]{t('avg_short')} {t('ui_benchmark')}[/{ACCENT}]  " + "  ".join(benchmark_parts)
             ))
 
-    ttl_value = snap.get("ttl")
-    ttl_hops = snap.get("ttl_hops")
-    if ttl_value is None:
-        ttl_markup = DEF_DASH
+    if last_ttl is None:
+        ttl_markup = DIM_DASH
     else:
-        ttl_markup = f"[{WHITE}]{ttl_value}[/{WHITE}]"
+        ttl_markup = _WHITE_CELL.format(last_ttl)
         if ttl_hops is not None:
-            ttl_markup += f" [{TEXT_DIM}]({ttl_hops} {t('hop_unit')})[/{TEXT_DIM}]"
+            ttl_markup += _TTL_HOPS.format(ttl_hops, t("hop_unit"))
 
-    mtu_value = snap.get("mtu")
-    mtu_markup = f"[{WHITE}]{mtu_value}[/{WHITE}]" if mtu_value else DEF_DASH
+    mtu_value = path_mtu if path_mtu is not None else local_mtu
+    mtu_markup = _WHITE_CELL.format(mtu_value) if mtu_value else DIM_DASH
     if connection_lost:
-        mtu_status_markup = f"[{RED}]{t('status_disconnected')}[/{RED}]"
+        mtu_status_markup = _RED_CELL.format(t("status_disconnected"))
     else:
-        mtu_status = snap.get("mtu_status", "...")
         if mtu_status == t("mtu_ok"):
-            mtu_status_markup = f"[{GREEN}]{mtu_status}[/{GREEN}]"
+            mtu_status_markup = _GREEN_CELL.format(mtu_status)
         elif mtu_status == t("mtu_low"):
-            mtu_status_markup = f"[{YELLOW}]{mtu_status}[/{YELLOW}]"
+            mtu_status_markup = _YELLOW_CELL.format(mtu_status)
         elif mtu_status == t("mtu_fragmented"):
-            mtu_status_markup = f"[{RED}]{mtu_status}[/{RED}]"
+            mtu_status_markup = _RED_CELL.format(mtu_status)
         else:
-            mtu_status_markup = f"[{TEXT_DIM}]{mtu_status}[/{TEXT_DIM}]"
+            mtu_status_markup = _DIM_CELL.format(mtu_status)
 
-    traceroute_running = snap.get("traceroute_running", False)
-    last_trace = snap.get("last_traceroute_time")
     if traceroute_running:
-        traceroute_markup = f"[{YELLOW}]{t('traceroute_running')}[/{YELLOW}]"
+        traceroute_markup = _YELLOW_CELL.format(t("traceroute_running"))
     elif last_trace is not None:
-        traceroute_markup = f"[{TEXT_DIM}]{fmt_since(last_trace)}[/{TEXT_DIM}]"
+        traceroute_markup = _DIM_CELL.format(fmt_since(last_trace, now_utc))
     else:
-        traceroute_markup = f"[{TEXT_DIM}]{t('never')}[/{TEXT_DIM}]"
+        traceroute_markup = _DIM_CELL.format(t("never"))
 
-    items.append(Text(""))
+    items.append(BLANK_LINE)
     items.append(section_header(t("network"), inner_w))
     network_tbl = dual_kv_table(width)
-    network_tbl.add_row(f"{t('ttl')}:", ttl_markup, f"{t('mtu')}:", mtu_markup)
-    network_tbl.add_row(f"{t('mtu_status_label')}:", mtu_status_markup, f"{t('traceroute')}:", traceroute_markup)
+    network_tbl.add_row(key_label("ttl"), ttl_markup, key_label("mtu"), mtu_markup)
+    network_tbl.add_row(key_label("mtu_status_label"), mtu_status_markup, key_label("traceroute"), traceroute_markup)
     items.append(network_tbl)
 
     return Panel(
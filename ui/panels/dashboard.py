@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 
 from rich import box
@@ -9,13 +10,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
-from ui.theme import ACCENT, ACCENT_DIM, BG, CRITICAL_BG, GREEN, LayoutTier, RED, TEXT_DIM, WHITE, YELLOW
-from ui.helpers import fmt_uptime, get_connection_state
-
-try:
-    from config import t
-except ImportError:
-    from ...config import t  # type: ignore[no-redef]
+from ui.theme import ACCENT, ACCENT_DIM, BG, CRITICAL_BG, GREEN, LayoutTier, RED, TEXT_DIM, WHITE
+from ui.helpers import dim_label, fmt_uptime, get_connection_state, loss_color, t
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
@@ -25,6 +21,9 @@ TREND_UP = "\u2197"
 TREND_DOWN = "\u2198"
 TREND_FLAT = "\u2192"
 DOT = "\u25cf"
+_BOLD_WHITE = f"bold {WHITE}"
+_DOT_OK = (DOT, GREEN)
+_DOT_FAIL = (DOT, RED)
 
 
 def _trend_icon(recent: list[bool]) -> str:
@@ -42,29 +41,34 @@ def _trend_icon(recent: list[bool]) -> str:
     return TREND_FLAT
 
 
-def _result_strip(recent: list[bool], max_dots: int = 18) -> str:
+def _result_strip(recent: list[bool], max_dots: int = 18) -> Text:
     """Render the recent history as a compact signal strip."""
     dots = recent[-max_dots:]
     if not dots:
-        return f"[{TEXT_DIM}]{t('ui_signal_none')}[/{TEXT_DIM}]"
-    parts: list[str] = []
-    for ok in dots:
-        color = GREEN if ok else RED
-        parts.append(f"[{color}]{DOT}[/{color}]")
-    return "".join(parts)
-
-
-def render_dashboard(snap: StatsSnapshot, width: int, tier: LayoutTier) -> Panel:
+        return Text(t("ui_signal_none"), style=TEXT_DIM)
+    return Text.assemble(*[_DOT_OK if ok else _DOT_FAIL for ok in dots])
+
+
+def render_dashboard(
+    snap: StatsSnapshot,
+    width: int,
+    tier: LayoutTier,
+    *,
+    now_utc: datetime | None = None,
+    connection_lost: bool | None = None,
+) -> Panel:
     """Render the hero telemetry strip."""
-    label, color, icon = get_connection_state(snap)
+    if connection_lost is None:
+        connection_lost = snap["threshold_states"]["connection_lost"]
+    recent = snap["recent_results"]
+    loss30 = snap["loss_recent_pct"]
+    label, color, icon = get_connection_state(snap, loss30, connection_lost=connection_lost)
     current = snap["last_latency_ms"]
     ping_txt = f"{current}" if current != t("na") else "-"
 
-    recent = snap["recent_results"]
-    loss30 = recent.count(False) / len(recent) * 100 if recent else 0.0
-    loss_color = GREEN if loss30 < 1 else (YELLOW if loss30 < 5 else RED)
-    uptime_txt = fmt_uptime(snap["start_time"])
-    jitter = snap.get("jitter", 0.0)
+    loss_style = loss_color(loss30)
+    uptime_txt = fmt_uptime(snap["start_time"], now_utc)
+    jitter = snap["jitter"]
     jitter_txt = f"{jitter:.1f}" if jitter > 0 else "-"
 
     trend = _trend_icon(recent)
@@ -76,37 +80,36 @@ def render_dashboard(snap: StatsSnapshot, width: int, tier: LayoutTier) -> Panel
         trend_color = TEXT_DIM
 
     history = _result_strip(recent)
-    bg_color = CRITICAL_BG if snap.get("threshold_states", {}).get("connection_lost") else BG
+    bg_color = CRITICAL_BG if connection_lost else BG
 
+    state = (f"{icon} {label}", f"bold {color}")
+    ms_unit = dim_label("ms")
+    loss = (dim_label("loss"), " ", (f"{loss30:.1f}%", f"bold {loss_style}"))
     if tier == "compact":
-        body = Text.from_markup(
-            f"[bold {color}]{icon} {label}[/bold {color}]  "
-            f"[{TEXT_DIM}]{t('ui_live')}[/{TEXT_DIM}] [bold {WHITE}]{ping_txt}[/bold {WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]  "
-            f"[{TEXT_DIM}]{t('loss')}[/{TEXT_DIM}] [bold {loss_color}]{loss30:.1f}%[/bold {loss_color}]"
+        body = Text.assemble(
+            state, "  ", dim_label("ui_live"), " ", (ping_txt, _BOLD_WHITE), " ", ms_unit, "  ", *loss,
         )
     else:
         grid = Table.grid(expand=True)
         grid.add_column(ratio=3)
         grid.add_column(ratio=2, justify="right")
-        left = Text.from_markup(
-            f"[bold {color}]{icon} {label}[/bold {color}]  "
-            f"[{TEXT_DIM}]{t('ui_live_latency')}[/{TEXT_DIM}] [bold {WHITE}]{ping_txt}[/bold {WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]  "
-            f"[{trend_color}]{trend}[/{trend_color}]"
+        left = Text.assemble(
+            state, "  ", dim_label("ui_live_latency"), " ", (ping_txt, _BOLD_WHITE), " ", ms_unit, "  ",
+            (trend, trend_color),
         )
-        right = Text.from_markup(
-            f"[{TEXT_DIM}]{t('jitter')}[/{TEXT_DIM}] [{WHITE}]{jitter_txt}[/{WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]  "
-            f"[{TEXT_DIM}]{t('loss')}[/{TEXT_DIM}] [bold {loss_color}]{loss30:.1f}%[/bold {loss_color}]"
+        right = Text.assemble(
+            dim_label("jitter"), " ", (jitter_txt, WHITE), " ", ms_unit, "  ", *loss,
         )
         grid.add_row(left, right)
         grid.add_row(
-            Text.from_markup(f"[{TEXT_DIM}]{t('uptime')}[/{TEXT_DIM}] [{WHITE}]{uptime_txt}[/{WHITE}]"),
-            Text.from_markup(f"[{ACCENT}]{t('ui_history')}[/{ACCENT}] {history}"),
+            Text.assemble((t("uptime"), TEXT_DIM), " ", (uptime_txt, WHITE)),
+            Text.assemble((t("ui_history"), ACCENT), " ", history),
         )
         body = grid
 
     return Panel(
         body,
-        border_style=color if snap.get("threshold_states", {}).get("connection_lost") else ACCENT_DIM,
+        border_style=color if connection_lost else ACCENT_DIM,
         box=box.ROUNDED,
         width=width,
         style=f"on {bg_color}",
@@ -10,22 +10,33 @@ from rich.panel import Panel
 from rich.text import Text
 
 from ui.theme import ACCENT, ACCENT_DIM, BG, LayoutTier, TEXT_DIM, YELLOW
+from ui.helpers import t
 
 try:
-    from config import LOG_FILE, VERSION, t
+    from config import LOG_FILE, VERSION
 except ImportError:
-    from ...config import LOG_FILE, VERSION, t  # type: ignore[no-redef]
+    from ...config import LOG_FILE, VERSION  # type: ignore[no-redef]
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
 
 
+def _home_relative(path: str, home: str) -> str:
+    """Abbreviate a leading *home* directory in *path* to ``~``."""
+    if home and home != os.sep and (path == home or path.startswith(home + os.sep)):
+        return "~" + path[len(home):]
+    return path
+
+
+# LOG_FILE and the home directory are fixed for the life of the process.
+_LOG_FILE_DISPLAY = _home_relative(LOG_FILE, os.path.expanduser("~"))
+
+
 def render_footer(snap: StatsSnapshot, width: int, tier: LayoutTier) -> Panel:
     """Render the lower status rail with log path and update state."""
-    log_path = LOG_FILE.replace(os.path.expanduser("~"), "~")
-    body = Text.from_markup(f"[{TEXT_DIM}]{t('footer').format(log_file=log_path)}[/{TEXT_DIM}]")
+    body = Text(t("footer").format(log_file=_LOG_FILE_DISPLAY), style=TEXT_DIM)
 
-    latest_version = snap.get("latest_version")
+    latest_version = snap["latest_version"]
     if latest_version:
         body.append("  |  ", style=ACCENT)
         body.append(f"v{VERSION} -> v{latest_version}", style=YELLOW)
@@ -11,24 +11,47 @@ from rich.table import Table
 from rich.text import Text
 
 from ui.theme import ACCENT, ACCENT_DIM, BG, CRITICAL_BG, LayoutTier, TEXT_DIM, WHITE, YELLOW
+from ui.helpers import key_label, markup_text, t
 
 try:
-    from config import TARGET_IP, VERSION, t
+    from config import TARGET_IP, VERSION
 except ImportError:
-    from ...config import TARGET_IP, VERSION, t  # type: ignore[no-redef]
+    from ...config import TARGET_IP, VERSION  # type: ignore[no-redef]
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
 
 
-def render_header(snap: StatsSnapshot, width: int, tier: LayoutTier) -> Panel:
+# Markup templates; only the translated strings are substituted per render.
+_VERSION_ONLY = f"[{TEXT_DIM}]v{VERSION}[/{TEXT_DIM}]"
+_VERSION_UPDATE = _VERSION_ONLY + f" [{YELLOW}]{{update}} {{latest}}[/{YELLOW}]"
+_VERSION_CURRENT = _VERSION_ONLY + f" [{ACCENT}]{{}}[/{ACCENT}]"
+_TITLE = (
+    f"[bold {ACCENT}]{{app}}[/bold {ACCENT}] - "
+    f"[bold {WHITE}]{{title}}[/bold {WHITE}] "
+    f"[bold {YELLOW}]{TARGET_IP}[/bold {YELLOW}]"
+)
+
+
+def render_header(
+    snap: StatsSnapshot,
+    width: int,
+    tier: LayoutTier,
+    *,
+    now_utc: datetime | None = None,
+    connection_lost: bool | None = None,
+) -> Panel:
     """Render the top identity bar with target, version, and live clock."""
-    now = datetime.now(timezone.utc).astimezone().strftime("%H:%M:%S")
-    latest_version = snap.get("latest_version")
-    version_up_to_date = snap.get("version_up_to_date", False)
-    public_ip = snap.get("public_ip") or t("na")
-    country = snap.get("country")
-    country_code = snap.get("country_code")
+    if connection_lost is None:
+        connection_lost = snap["threshold_states"]["connection_lost"]
+    if now_utc is None:
+        now_utc = datetime.now(timezone.utc)
+    now = now_utc.astimezone().strftime("%H:%M:%S")
+    latest_version = snap["latest_version"]
+    version_up_to_date = snap["version_up_to_date"]
+    public_ip = snap["public_ip"] or t("na")
+    country = snap["country"]
+    country_code = snap["country_code"]
     # Show full country name if available, otherwise show country code, otherwise just IP
     if country and country != "..." and country != "N/A":
         location = f"{public_ip} ({country})"
@@ -38,37 +61,30 @@ def render_header(snap: StatsSnapshot, width: int, tier: LayoutTier) -> Panel:
         location = str(public_ip)
 
     if latest_version:
-        version_text = f"[{TEXT_DIM}]v{VERSION}[/{TEXT_DIM}] [{YELLOW}]{t('ui_update')} {latest_version}[/{YELLOW}]"
+        version_text = _VERSION_UPDATE.format(update=t("ui_update"), latest=latest_version)
     elif version_up_to_date:
-        version_text = f"[{TEXT_DIM}]v{VERSION}[/{TEXT_DIM}] [{ACCENT}]{t('version_up_to_date')}[/{ACCENT}]"
+        version_text = _VERSION_CURRENT.format(t("version_up_to_date"))
     else:
-        version_text = f"[{TEXT_DIM}]v{VERSION}[/{TEXT_DIM}]"
+        version_text = _VERSION_ONLY
 
-    title = Text.from_markup(
-        f"[bold {ACCENT}]{t('ui_app_name')}[/bold {ACCENT}] - "
-        f"[bold {WHITE}]{t('title')}[/bold {WHITE}] "
-        f"[bold {YELLOW}]{TARGET_IP}[/bold {YELLOW}]"
-    )
+    title = markup_text(_TITLE.format(app=t("ui_app_name"), title=t("title")))
 
     if tier == "compact":
-        body = Text.from_markup(
-            f"[bold {WHITE}]{t('title')}[/bold {WHITE}] "
-            f"[{ACCENT}]{TARGET_IP}[/{ACCENT}] "
-            f"[{TEXT_DIM}]|[/{TEXT_DIM}] "
-            f"[{TEXT_DIM}]{now}[/{TEXT_DIM}]"
+        body = Text.assemble(
+            (t("title"), f"bold {WHITE}"), " ", (TARGET_IP, ACCENT), " ", ("|", TEXT_DIM), " ", (now, TEXT_DIM),
         )
     else:
         grid = Table.grid(expand=True)
         grid.add_column(ratio=3)
         grid.add_column(ratio=2, justify="right")
-        grid.add_row(title, Text.from_markup(version_text))
+        grid.add_row(title, markup_text(version_text))
         grid.add_row(
-            Text.from_markup(f"[{TEXT_DIM}]{t('ui_live_target')}:[/{TEXT_DIM}] [{WHITE}]{location}[/{WHITE}]"),
-            Text.from_markup(f"[{TEXT_DIM}]{t('ui_local_time')}:[/{TEXT_DIM}] [{WHITE}]{now}[/{WHITE}]"),
+            Text.assemble((key_label("ui_live_target"), TEXT_DIM), " ", (location, WHITE)),
+            Text.assemble((key_label("ui_local_time"), TEXT_DIM), " ", (now, WHITE)),
         )
         body = grid
 
-    bg_color = CRITICAL_BG if snap.get("threshold_states", {}).get("connection_lost") else BG
+    bg_color = CRITICAL_BG if connection_lost else BG
     return Panel(
         body,
         border_style=ACCENT_DIM,
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
 
 from rich import box
 from rich.console import Group
@@ -11,12 +15,16 @@ from rich.table import Table
 from rich.text import Text
 
 from ui.theme import ACCENT, ACCENT_DIM, BG, GREEN, HeightTier, LayoutTier, RED, TEXT_DIM, WHITE, YELLOW
-from ui.helpers import lat_color, render_trend_arrow, sparkline
+from ui.helpers import DIM_DASH, markup_text, render_trend_arrow, sparkline, t
 
 try:
-    from config import HOP_LATENCY_GOOD, t
+    from config import HOP_LATENCY_GOOD, HOP_LATENCY_WARN, HOP_SPARKLINE_POINTS
 except ImportError:
-    from ...config import HOP_LATENCY_GOOD, t  # type: ignore[no-redef]
+    from ...config import (  # type: ignore[no-redef]
+        HOP_LATENCY_GOOD,
+        HOP_LATENCY_WARN,
+        HOP_SPARKLINE_POINTS,
+    )
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
@@ -24,44 +32,195 @@ if TYPE_CHECKING:
 
 DOT = "\u25cf"
 SEPARATOR = "\u2502"
+ROW_CACHE_MAX = 256
+# Column order of the per-hop tuples read from the snapshot's hop_monitor_columns;
+# matches the parameters of the _build_row_* functions.
+ROW_FIELDS = (
+    "hop", "last_latency", "avg_latency", "min_latency", "loss_pct", "jitter", "latency_delta",
+    "last_ok", "hostname", "ip", "country_code", "asn", "latency_history", "latency_range",
+)
+_row_columns = itemgetter(*ROW_FIELDS)
+
+
+# Severity levels 0..2 (ok, degraded, bad) index these precomputed markup tables.
+_LEVEL_COLORS = (GREEN, YELLOW, RED)
+_STATUS_DOT = tuple(f"[{color}]{DOT}[/{color}]" for color in _LEVEL_COLORS)
+# Latency cells: bisect_left on the inclusive upper bounds gives the level, as in lat_color.
+_LATENCY_THRESHOLDS = (HOP_LATENCY_GOOD, HOP_LATENCY_WARN)
+_LATENCY_CELLS = tuple(f"[{color}]{{:.0f}}[/{color}]" for color in _LEVEL_COLORS)
+_LOSS_CELLS = tuple(f"[{color}]{{:.0f}}%[/{color}]" for color in _LEVEL_COLORS)
+# Delta cells by trend sign (-1, 0, +1); formatted with the arrow and the delta.
+_DELTA_CELLS = {
+    1: f"[{YELLOW}]{{}}+{{:.0f}}[/{YELLOW}]",
+    0: f"[{TEXT_DIM}]{{}}0[/{TEXT_DIM}]",
+    -1: f"[{GREEN}]{{}}{{:.0f}}[/{GREEN}]",
+}
+_DIM_CELL = f"[{TEXT_DIM}]{{}}[/{TEXT_DIM}]"
+_JITTER_CELL = f"[{TEXT_DIM}]{{:.0f}}[/{TEXT_DIM}]"
+_HOST_CELL = f"{{}} [{TEXT_DIM}]{{}}[/{TEXT_DIM}]"
+_TITLE = f"[bold {ACCENT}]{{}}[/bold {ACCENT}]"
+
+
+def _classify_hop(ok: bool, loss_pct: float) -> tuple[int, int]:
+    """Return ``(status level, loss level)`` for a hop's current metrics."""
+    if not ok:
+        status = 2
+    elif loss_pct > 0:
+        status = 1
+    else:
+        status = 0
+    if loss_pct >= 10:
+        loss_level = 2
+    elif loss_pct > 0:
+        loss_level = 1
+    else:
+        loss_level = 0
+    return status, loss_level
+
+
+def _delta_cell(delta: float) -> str:
+    return _DELTA_CELLS[(delta > 0) - (delta < 0)].format(render_trend_arrow(delta), delta)
+
+
+def _worst_hop(last_ok: Sequence[bool], last_latency: Sequence[float | None]) -> tuple[int, float]:
+    """Return ``(index, latency)`` of the hop to flag; a down hop reports ``inf``.
+
+    The last unreachable hop wins; otherwise the first hop with the highest
+    latest latency. Returns ``(-1, 0.0)`` when there is nothing to flag.
+    """
+    down = [idx for idx, ok in enumerate(last_ok) if not ok]
+    if down:
+        return down[-1], float("inf")
+    worst = max(
+        ((idx, float(value)) for idx, value in enumerate(last_latency) if value is not None),
+        key=itemgetter(1),
+        default=None,
+    )
+    if worst is None or worst[1] <= 0.0:
+        return -1, 0.0
+    return worst
 
 
 def _fmt_latency(value: Any) -> str:
     if value is None:
-        return f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
-    color = lat_color(float(value))
-    return f"[{color}]{float(value):.0f}[/{color}]"
+        return DIM_DASH
+    value = float(value)
+    return _LATENCY_CELLS[bisect_left(_LATENCY_THRESHOLDS, value)].format(value)
+
+
+def _host_cell(hostname: str, ip: str) -> str:
+    return _HOST_CELL.format(hostname, ip) if hostname != ip else ip
+
+
+def _trend_cell(history: tuple[float, ...], history_range: tuple[float, float] | None) -> str:
+    points = history[-HOP_SPARKLINE_POINTS:]
+    if len(points) < 2:
+        return DIM_DASH
+    # The producer's (min, max) only applies when it covers the same window.
+    bounds = history_range if len(history) <= HOP_SPARKLINE_POINTS else None
+    return sparkline(points, HOP_SPARKLINE_POINTS, bounds=bounds)
+
+
+def _build_row_compact(
+    hop_num: Any,
+    last_latency: Any,
+    avg_latency: Any,
+    min_latency: Any,
+    loss_pct: float,
+    jitter: float,
+    delta: float,
+    ok: bool,
+    hostname: str,
+    ip: str,
+    country_code: str,
+    asn: str,
+    history: tuple[float, ...],
+    history_range: tuple[float, float] | None,
+) -> tuple[str, ...]:
+    """Build the compact-tier cells of one hop row from its ``ROW_FIELDS`` values."""
+    status, loss_level = _classify_hop(ok, loss_pct)
+    return (
+        str(hop_num),
+        _STATUS_DOT[status],
+        _fmt_latency(avg_latency),
+        _fmt_latency(last_latency if ok else None),
+        _LOSS_CELLS[loss_level].format(loss_pct),
+        _host_cell(hostname, ip),
+    )
 
 
-def render_hop_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_tier: HeightTier) -> Panel:
-    """Render the hop health table panel."""
-    connection_lost = bool(snap.get("threshold_states", {}).get("connection_lost", False))
-    hops = snap.get("hop_monitor_hops", [])
-    discovering = snap.get("hop_monitor_discovering", False)
+def _build_row_extended(
+    hop_num: Any,
+    last_latency: Any,
+    avg_latency: Any,
+    min_latency: Any,
+    loss_pct: float,
+    jitter: float,
+    delta: float,
+    ok: bool,
+    hostname: str,
+    ip: str,
+    country_code: str,
+    asn: str,
+    history: tuple[float, ...],
+    history_range: tuple[float, float] | None,
+) -> tuple[str, ...]:
+    """Build the standard-tier cells, adding min, delta, jitter and the trend sparkline."""
+    status, loss_level = _classify_hop(ok, loss_pct)
+    return (
+        str(hop_num),
+        _STATUS_DOT[status],
+        _fmt_latency(min_latency),
+        _fmt_latency(avg_latency),
+        _fmt_latency(last_latency if ok else None),
+        _delta_cell(delta),
+        _JITTER_CELL.format(jitter) if jitter > 0 else DIM_DASH,
+        _LOSS_CELLS[loss_level].format(loss_pct),
+        _trend_cell(history, history_range),
+        _host_cell(hostname, ip),
+    )
 
-    if connection_lost:
-        body = Text.from_markup(f"  [{RED}]{t('status_disconnected')}[/{RED}]")
-        return Panel(body, title=f"[bold {ACCENT}]{t('hop_health')}[/bold {ACCENT}]", title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
 
-    if discovering and not hops:
-        body = Text.from_markup(f"  [{TEXT_DIM}]{t('hop_discovering')}[/{TEXT_DIM}]")
-        return Panel(body, title=f"[bold {ACCENT}]{t('hop_health')}[/bold {ACCENT}]", title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
+def _build_row_wide(
+    hop_num: Any,
+    last_latency: Any,
+    avg_latency: Any,
+    min_latency: Any,
+    loss_pct: float,
+    jitter: float,
+    delta: float,
+    ok: bool,
+    hostname: str,
+    ip: str,
+    country_code: str,
+    asn: str,
+    history: tuple[float, ...],
+    history_range: tuple[float, float] | None,
+) -> tuple[str, ...]:
+    """Build the wide-tier cells: the standard columns plus ASN and location."""
+    status, loss_level = _classify_hop(ok, loss_pct)
+    return (
+        str(hop_num),
+        _STATUS_DOT[status],
+        _fmt_latency(min_latency),
+        _fmt_latency(avg_latency),
+        _fmt_latency(last_latency if ok else None),
+        _delta_cell(delta),
+        _JITTER_CELL.format(jitter) if jitter > 0 else DIM_DASH,
+        _LOSS_CELLS[loss_level].format(loss_pct),
+        _trend_cell(history, history_range),
+        _DIM_CELL.format(asn) if asn else "",
+        _DIM_CELL.format(country_code) if country_code else "",
+        _host_cell(hostname, ip),
+    )
 
-    if not hops:
-        body = Text.from_markup(f"  [{TEXT_DIM}]{t('hop_none')}[/{TEXT_DIM}]")
-        return Panel(body, title=f"[bold {ACCENT}]{t('hop_health')}[/bold {ACCENT}]", title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
 
-    show_extended = tier != "compact"
-    show_geo = tier == "wide"
+# Row builders indexed by ``show_extended + show_geo``; wide always implies extended.
+_ROW_BUILDERS = (_build_row_compact, _build_row_extended, _build_row_wide)
 
-    if h_tier == "minimal":
-        max_hops = 5
-    elif h_tier == "short":
-        max_hops = 8
-    else:
-        max_hops = len(hops)
-    display_hops = hops[:max_hops]
 
+def _hop_table(show_extended: bool, show_geo: bool) -> Table:
+    """Build the empty hop table with the columns of one tier."""
     table = Table(
         show_header=True,
         header_style=f"bold {WHITE}",
@@ -86,96 +245,107 @@ def render_hop_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_tier:
         table.add_column(t("hop_col_asn"), width=24, overflow="ellipsis", no_wrap=True)
         table.add_column(t("hop_col_loc"), width=8, no_wrap=True)
     table.add_column(t("hop_col_host"), ratio=1, overflow="ellipsis")
+    return table
+
+
+def render_hop_panel(
+    snap: StatsSnapshot,
+    width: int,
+    tier: LayoutTier,
+    h_tier: HeightTier,
+    *,
+    max_hops: int | None = None,
+    row_cache: OrderedDict[tuple[Any, ...], tuple[Text, ...]] | None = None,
+    connection_lost: bool | None = None,
+) -> Panel:
+    """Render the hop health table panel.
+
+    *max_hops* caps the rows drawn; when omitted it follows *h_tier* as the
+    layout does.
+
+    *row_cache* persists rendered rows across frames; a hop whose metrics are
+    unchanged reuses its parsed cells instead of re-formatting them. The least
+    recently drawn rows are evicted once it holds ``ROW_CACHE_MAX`` entries.
+    """
+    if connection_lost is None:
+        connection_lost = bool(snap["threshold_states"]["connection_lost"])
+    # Every hop field is read from the column tuples; the per-hop dicts are never touched here.
+    cols = snap["hop_monitor_columns"]
+    len_hops = len(cols["hop"])
+    discovering = snap["hop_monitor_discovering"]
 
-    worst_hop = None
-    worst_value = 0.0
-
-    for hop in display_hops:
-        hop_num = hop.get("hop", "?")
-        last_latency = hop.get("last_latency")
-        avg_latency = hop.get("avg_latency")
-        min_latency = hop.get("min_latency")
-        loss_pct = float(hop.get("loss_pct", 0.0) or 0.0)
-        jitter = float(hop.get("jitter", 0.0) or 0.0)
-        delta = float(hop.get("latency_delta", 0.0) or 0.0)
-        ok = bool(hop.get("last_ok", True))
-        hostname = hop.get("hostname") or hop.get("ip", "?")
-        ip = hop.get("ip", "?")
-        country_code = hop.get("country_code", "")
-        asn = hop.get("asn", "")
-
-        if not ok:
-            dot = f"[{RED}]{DOT}[/{RED}]"
-        elif loss_pct > 0:
-            dot = f"[{YELLOW}]{DOT}[/{YELLOW}]"
-        else:
-            dot = f"[{GREEN}]{DOT}[/{GREEN}]"
+    if connection_lost:
+        body = Text.assemble("  ", (t("status_disconnected"), RED))
+        return Panel(body, title=_TITLE.format(t("hop_health")), title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
+
+    if discovering and not len_hops:
+        body = Text.assemble("  ", (t("hop_discovering"), TEXT_DIM))
+        return Panel(body, title=_TITLE.format(t("hop_health")), title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
+
+    if not len_hops:
+        body = Text.assemble("  ", (t("hop_none"), TEXT_DIM))
+        return Panel(body, title=_TITLE.format(t("hop_health")), title_align="left", border_style=ACCENT_DIM, box=box.ROUNDED, width=width, style=f"on {BG}", padding=(0, 1))
+
+    show_extended = tier != "compact"
+    show_geo = tier == "wide"
 
-        if loss_pct >= 10:
-            loss_txt = f"[{RED}]{loss_pct:.0f}%[/{RED}]"
-        elif loss_pct > 0:
-            loss_txt = f"[{YELLOW}]{loss_pct:.0f}%[/{YELLOW}]"
+    if max_hops is None:
+        if h_tier == "minimal":
+            max_hops = 5
+        elif h_tier == "short":
+            max_hops = 8
         else:
-            loss_txt = f"[{GREEN}]{loss_pct:.0f}%[/{GREEN}]"
-
-        host_txt = f"{hostname} [{TEXT_DIM}]{ip}[/{TEXT_DIM}]" if hostname != ip else ip
-        row: list[str] = [str(hop_num), dot]
-
-        if show_extended:
-            row.append(_fmt_latency(min_latency))
-        row.append(_fmt_latency(avg_latency))
-        row.append(_fmt_latency(last_latency if ok else None))
-
-        if show_extended:
-            arrow = render_trend_arrow(delta)
-            if delta > 0:
-                delta_txt = f"[{YELLOW}]{arrow}+{delta:.0f}[/{YELLOW}]"
-            elif delta < 0:
-                delta_txt = f"[{GREEN}]{arrow}{delta:.0f}[/{GREEN}]"
-            else:
-                delta_txt = f"[{TEXT_DIM}]{arrow}0[/{TEXT_DIM}]"
-            jitter_txt = f"[{TEXT_DIM}]{jitter:.0f}[/{TEXT_DIM}]" if jitter > 0 else f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
-            row.extend([delta_txt, jitter_txt])
-
-        row.append(loss_txt)
-
-        if show_extended:
-            history = [float(v) for v in hop.get("latency_history", [])[-8:] if v is not None]
-            row.append(sparkline(history, 8) if len(history) >= 2 else f"[{TEXT_DIM}]-[/{TEXT_DIM}]")
-
-        if show_geo:
-            row.append(f"[{TEXT_DIM}]{asn}[/{TEXT_DIM}]" if asn else "")
-            row.append(f"[{TEXT_DIM}]{country_code}[/{TEXT_DIM}]" if country_code else "")
-
-        row.append(host_txt)
-        table.add_row(*row)
-
-        if not ok:
-            worst_hop = hop
-            worst_value = float("inf")
-        elif last_latency is not None and float(last_latency) > worst_value:
-            worst_hop = hop
-            worst_value = float(last_latency)
-
-    items: list[Table | Text] = [table]
-
-    if len(hops) > max_hops:
-        items.append(Text.from_markup(f"  [{TEXT_DIM}]+{t('more_hops').format(count=len(hops) - max_hops)}[/{TEXT_DIM}]"))
-
-    if worst_hop and worst_value > HOP_LATENCY_GOOD:
-        hop_no = worst_hop.get("hop", "?")
-        hop_ip = worst_hop.get("ip", "?")
+            max_hops = len_hops
+    truncated = max_hops < len_hops
+
+    table = _hop_table(show_extended, show_geo)
+
+    rows: Iterator[tuple[Any, ...]] = zip(*_row_columns(cols), strict=True)
+    if truncated:
+        rows = islice(rows, max_hops)
+    cache = row_cache if row_cache is not None else OrderedDict()
+    # Loop-invariant lookups bound once for the per-hop loop.
+    cache_get = cache.get
+    touch = cache.move_to_end
+    add_row = table.add_row
+    build_row = _ROW_BUILDERS[show_extended + show_geo]
+    for fields in rows:
+        key = (fields, show_extended, show_geo)
+        row = cache_get(key)
+        if row is None:
+            row = tuple(map(markup_text, build_row(*fields)))
+            if len(cache) >= ROW_CACHE_MAX:
+                cache.popitem(last=False)
+            cache[key] = row
+        else:
+            touch(key)
+        add_row(*row)
+
+    last_ok, last_latency = cols["last_ok"], cols["last_latency"]
+    if truncated:
+        last_ok, last_latency = last_ok[:max_hops], last_latency[:max_hops]
+    worst_idx, worst_value = _worst_hop(last_ok, last_latency)
+
+    # Notes under the table are joined into one Text, so the group holds at most two children.
+    notes: list[Text] = []
+
+    if truncated:
+        notes.append(Text.assemble("  ", ("+" + t("more_hops").format(count=len_hops - max_hops), TEXT_DIM)))
+
+    if worst_idx >= 0 and worst_value > HOP_LATENCY_GOOD:
+        hop_no = cols["hop"][worst_idx]
+        hop_ip = cols["ip"][worst_idx]
         if worst_value == float("inf"):
-            items.append(Text.from_markup(f"  [{RED}]{t('hop_worst')}: #{hop_no} {hop_ip} {t('hop_down')}[/{RED}]"))
+            notes.append(Text.assemble("  ", (f"{t('hop_worst')}: #{hop_no} {hop_ip} {t('hop_down')}", RED)))
         else:
-            items.append(Text.from_markup(f"  [{YELLOW}]{t('hop_worst')}: #{hop_no} {hop_ip} {worst_value:.0f} {t('ms')}[/{YELLOW}]"))
+            notes.append(Text.assemble("  ", (f"{t('hop_worst')}: #{hop_no} {hop_ip} {worst_value:.0f} {t('ms')}", YELLOW)))
 
     if discovering:
-        items.append(Text.from_markup(f"  [{TEXT_DIM}]{t('hop_discovering')}[/{TEXT_DIM}]"))
+        notes.append(Text.assemble("  ", (t("hop_discovering"), TEXT_DIM)))
 
     return Panel(
-        Group(*items),
-        title=f"[bold {ACCENT}]{t('hop_health')}[/bold {ACCENT}]",
+        Group(table, Text("\n").join(notes)) if notes else table,
+        title=_TITLE.format(t("hop_health")),
         title_align="left",
         border_style=ACCENT_DIM,
         box=box.ROUNDED,
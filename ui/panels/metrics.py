@@ -2,30 +2,45 @@
 
 from __future__ import annotations
 
-import statistics
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from rich import box
 from rich.console import Group
 from rich.panel import Panel
-from rich.table import Table
+from rich.table import Column, Table
 from rich.text import Text
 
 from ui.theme import ACCENT, ACCENT_DIM, BG_PANEL, GREEN, HeightTier, LayoutTier, RED, TEXT_DIM, WHITE, YELLOW
-from ui.helpers import fmt_bytes, mini_gauge, progress_bar, section_header, sparkline
-
-try:
-    from config import t
-except ImportError:
-    from ...config import t  # type: ignore[no-redef]
+from ui.helpers import (
+    BLANK_LINE,
+    DIM_DASH,
+    dim_label,
+    fmt_bytes,
+    key_label,
+    kv_table,
+    loss_color,
+    markup_text,
+    mini_gauge,
+    progress_bar,
+    section_header,
+    sparkline_text,
+    t,
+)
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
 
 
+# Markup templates, built once so each cell only substitutes its values.
+_MS_SUFFIX = f" [{TEXT_DIM}]{{}}[/{TEXT_DIM}]"
+_CURRENT_LATENCY = f"[bold {WHITE}]{{value}}[/bold {WHITE}] [{TEXT_DIM}]{{unit}}[/{TEXT_DIM}]"
+
+
 def _value_or_dash(value: float | None, color: str = WHITE, suffix: str = "") -> str:
     if value is None:
-        return f"[{TEXT_DIM}]-[/{TEXT_DIM}]"
+        return DIM_DASH
     return f"[{color}]{value:.1f}[/{color}]{suffix}"
 
 
@@ -39,109 +54,158 @@ def _traffic_markup(sent_bytes: int | None, recv_bytes: int | None) -> str:
     )
 
 
-def render_metrics_panel(snap: StatsSnapshot, width: int, tier: LayoutTier, h_tier: HeightTier) -> Panel:
+@lru_cache(maxsize=16)
+def _stat_columns(width: int) -> tuple[Column, ...]:
+    key_w = max(9, width // 6)
+    val_w = max(10, width // 5)
+    return (
+        Column("k1", style=TEXT_DIM, width=key_w, no_wrap=True),
+        Column("v1", width=val_w, no_wrap=True),
+        Column("k2", style=TEXT_DIM, width=key_w, no_wrap=True),
+        Column("v2", width=val_w, no_wrap=True),
+    )
+
+
+def _stat_table(width: int) -> Table:
+    """Four-column key/value table used by the latency profile and counters."""
+    columns = [col.copy() for col in _stat_columns(width)]
+    return Table(*columns, show_header=False, box=None, padding=(0, 1), width=width)
+
+
+@dataclass(frozen=True)
+class _MetricsPlan:
+    """Layout decisions that depend only on the panel geometry."""
+
+    inner_w: int
+    trend_w: int | None
+    jitter_w: int | None
+    gauge_w: int | None
+
+
+@lru_cache(maxsize=16)
+def _metrics_plan(width: int, tier: LayoutTier, h_tier: HeightTier) -> _MetricsPlan:
+    """Resolve the tier branches once per size; ``None`` widths hide that row."""
+    detailed = h_tier in ("standard", "full")
+    trend = tier != "compact" and h_tier != "minimal"
+    return _MetricsPlan(
+        inner_w=max(20, width - 4),
+        trend_w=max(12, width - 20) if trend else None,
+        jitter_w=max(12, width - 26) if trend and detailed else None,
+        gauge_w=max(10, width - 24) if detailed else None,
+    )
+
+
+def render_metrics_panel(
+    snap: StatsSnapshot,
+    width: int,
+    tier: LayoutTier,
+    h_tier: HeightTier,
+    *,
+    connection_lost: bool | None = None,
+) -> Panel:
     """Render a premium latency and reliability panel."""
+    if connection_lost is None:
+        connection_lost = snap["threshold_states"]["connection_lost"]
     latencies = snap["latencies"]
-    jitter_hist = snap.get("jitter_history", [])
-    avg = (snap["total_latency_sum"] / snap["success"]) if snap["success"] > 0 else None
-    med = statistics.median(latencies) if latencies else None
-    jit = snap.get("jitter", 0.0) or None
-    p95 = statistics.quantiles(latencies, n=20)[18] if len(latencies) >= 20 else (max(latencies) if latencies else None)
+    jitter_hist = snap["jitter_history"]
+    total = snap["total"]
+    success = snap["success"]
+    failure = snap["failure"]
+    min_latency = snap["min_latency"]
+    avg = (snap["total_latency_sum"] / success) if success > 0 else None
+    med, p95 = snap["latency_median"], snap["latency_p95"]
+    jit = snap["jitter"] or None
     current = snap["last_latency_ms"]
 
+    ms = t("ms")
     current_markup = (
-        f"[bold {WHITE}]{current}[/bold {WHITE}] [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]"
+        _CURRENT_LATENCY.format(value=current, unit=ms)
         if current != t("na")
         else f"[{TEXT_DIM}]{t('waiting')}[/{TEXT_DIM}]"
     )
-    best_markup = _value_or_dash(None if snap["min_latency"] == float("inf") else snap["min_latency"], GREEN, f" [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]")
-    avg_markup = _value_or_dash(avg, YELLOW, f" [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]")
-    med_markup = _value_or_dash(med, WHITE, f" [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]")
-    p95_markup = _value_or_dash(p95, WHITE, f" [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]")
-    jitter_markup = _value_or_dash(jit, WHITE, f" [{TEXT_DIM}]{t('ms')}[/{TEXT_DIM}]")
-
-    success_rate = (snap["success"] / snap["total"] * 100) if snap["total"] else 0.0
-    total_loss = (snap["failure"] / snap["total"] * 100) if snap["total"] else 0.0
-    recent = snap["recent_results"]
-    loss30 = recent.count(False) / len(recent) * 100 if recent else 0.0
+    ms_suffix = _MS_SUFFIX.format(ms)
+    best_markup = _value_or_dash(None if min_latency == float("inf") else min_latency, GREEN, ms_suffix)
+    avg_markup = _value_or_dash(avg, YELLOW, ms_suffix)
+    med_markup = _value_or_dash(med, WHITE, ms_suffix)
+    p95_markup = _value_or_dash(p95, WHITE, ms_suffix)
+    jitter_markup = _value_or_dash(jit, WHITE, ms_suffix)
+
+    success_rate = snap["success_rate"]
+    total_loss = snap["loss_total_pct"]
+    loss30 = snap["loss_recent_pct"]
     sr_color = GREEN if success_rate >= 98 else (YELLOW if success_rate >= 92 else RED)
-    loss_color = GREEN if loss30 < 1 else (YELLOW if loss30 < 5 else RED)
+    loss_style = loss_color(loss30)
 
+    plan = _metrics_plan(width, tier, h_tier)
+    inner_w = plan.inner_w
     items: list[Table | Text] = []
-    inner_w = max(20, width - 4)
 
-    items.append(Text.from_markup(
-        f"  [{TEXT_DIM}]{t('ui_live_latency')}[/{TEXT_DIM}] {current_markup}  "
-        f"[{TEXT_DIM}]{t('ui_stability')}[/{TEXT_DIM}] [bold {sr_color}]{success_rate:.1f}%[/bold {sr_color}]"
+    items.append(Text.assemble(
+        "  ", dim_label("ui_live_latency"), " ", markup_text(current_markup), "  ",
+        dim_label("ui_stability"), " ", (f"{success_rate:.1f}%", f"bold {sr_color}"),
     ))
 
-    if tier != "compact" and h_tier != "minimal":
-        items.append(Text.from_markup(
-            f"  [{TEXT_DIM}]{t('ui_trend')}[/{TEXT_DIM}] {sparkline(list(latencies), width=max(12, width - 20))}"
+    if plan.trend_w is not None:
+        items.append(Text.assemble(
+            "  ", dim_label("ui_trend"), " ", sparkline_text(latencies, width=plan.trend_w),
         ))
-        if h_tier in ("standard", "full"):
-            items.append(Text.from_markup(
-                f"  [{TEXT_DIM}]{t('ui_jitter_trail')}[/{TEXT_DIM}] {sparkline(list(jitter_hist), width=max(12, width - 26)) if jitter_hist else f'[{TEXT_DIM}]-[/{TEXT_DIM}]'}"
-            ))
-
-    items.append(Text(""))
+    if plan.jitter_w is not None:
+        jitter_trail = (
+            sparkline_text(jitter_hist, width=plan.jitter_w)
+            if jitter_hist
+            else Text("-", style=TEXT_DIM)
+        )
+        items.append(Text.assemble("  ", dim_label("ui_jitter_trail"), " ", jitter_trail))
+
+    items.append(BLANK_LINE)
     items.append(section_header(t("lat"), inner_w))
 
-    profile = Table(show_header=False, box=None, padding=(0, 1), width=width)
-    profile.add_column("k1", style=TEXT_DIM, width=max(9, width // 6), no_wrap=True)
-    profile.add_column("v1", width=max(10, width // 5), no_wrap=True)
-    profile.add_column("k2", style=TEXT_DIM, width=max(9, width // 6), no_wrap=True)
-    profile.add_column("v2", width=max(10, width // 5), no_wrap=True)
-    profile.add_row(f"{t('average')}:", avg_markup, f"{t('median')}:", med_markup)
-    profile.add_row(f"{t('best')}:", best_markup, f"{t('p95')}:", p95_markup)
-    profile.add_row(f"{t('jitter')}:", jitter_markup, f"{t('current')}:", current_markup)
+    profile = _stat_table(width)
+    profile.add_row(key_label("average"), avg_markup, key_label("median"), med_markup)
+    profile.add_row(key_label("best"), best_markup, key_label("p95"), p95_markup)
+    profile.add_row(key_label("jitter"), jitter_markup, key_label("current"), current_markup)
     items.append(profile)
 
-    items.append(Text(""))
+    items.append(BLANK_LINE)
     items.append(section_header(t("stats"), inner_w))
 
-    stats = Table(show_header=False, box=None, padding=(0, 1), width=width)
-    stats.add_column("k1", style=TEXT_DIM, width=max(9, width // 6), no_wrap=True)
-    stats.add_column("v1", width=max(10, width // 5), no_wrap=True)
-    stats.add_column("k2", style=TEXT_DIM, width=max(9, width // 6), no_wrap=True)
-    stats.add_column("v2", width=max(10, width // 5), no_wrap=True)
-    stats.add_row(f"{t('sent')}:", f"[{WHITE}]{snap['total']}[/{WHITE}]", f"{t('ok_count')}:", f"[{GREEN}]{snap['success']}[/{GREEN}]")
-    stats.add_row(f"{t('lost')}:", f"[{RED}]{snap['failure']}[/{RED}]", f"{t('losses')}:", f"[{loss_color}]{total_loss:.1f}%[/{loss_color}]")
-    stats.add_row(f"{t('loss_30m')}:", f"[{loss_color}]{loss30:.1f}%[/{loss_color}]", f"{t('success_rate')}:", f"[{sr_color}]{success_rate:.1f}%[/{sr_color}]")
+    stats = _stat_table(width)
+    stats.add_row(key_label("sent"), f"[{WHITE}]{total}[/{WHITE}]", key_label("ok_count"), f"[{GREEN}]{success}[/{GREEN}]")
+    stats.add_row(key_label("lost"), f"[{RED}]{failure}[/{RED}]", key_label("losses"), f"[{loss_style}]{total_loss:.1f}%[/{loss_style}]")
+    stats.add_row(key_label("loss_30m"), f"[{loss_style}]{loss30:.1f}%[/{loss_style}]", key_label("success_rate"), f"[{sr_color}]{success_rate:.1f}%[/{sr_color}]")
     items.append(stats)
 
-    if h_tier in ("standard", "full"):
-        gauge_w = max(10, width - 24)
-        items.append(Text(""))
-        items.append(Text.from_markup(
-            f"  [{TEXT_DIM}]{t('success_rate')}[/{TEXT_DIM}] {mini_gauge(success_rate, width=gauge_w, color=sr_color)}"
+    gauge_w = plan.gauge_w
+    if gauge_w is not None:
+        items.append(BLANK_LINE)
+        items.append(Text.assemble(
+            "  ", dim_label("success_rate"), " ",
+            markup_text(mini_gauge(success_rate, width=gauge_w, color=sr_color)),
         ))
-        items.append(Text.from_markup(
-            f"  [{TEXT_DIM}]{t('loss_30m')}[/{TEXT_DIM}] [{loss_color}]{loss30:.1f}%[/{loss_color}] "
-            f"{progress_bar(loss30, width=gauge_w, color=loss_color)}"
+        items.append(Text.assemble(
+            "  ", dim_label("loss_30m"), " ", (f"{loss30:.1f}%", loss_style), " ",
+            markup_text(progress_bar(loss30, width=gauge_w, color=loss_style)),
         ))
 
     cons = snap["consecutive_losses"]
-    if snap["threshold_states"]["connection_lost"]:
-        cons_markup = f"[bold {RED}]{cons}[/bold {RED}]"
+    if connection_lost:
+        cons_style = f"bold {RED}"
     elif cons > 0:
-        cons_markup = f"[{YELLOW}]{cons}[/{YELLOW}]"
+        cons_style = YELLOW
     else:
-        cons_markup = f"[{GREEN}]{cons}[/{GREEN}]"
+        cons_style = GREEN
 
-    items.append(Text(""))
-    items.append(Text.from_markup(
-        f"  [{TEXT_DIM}]{t('consecutive')}[/{TEXT_DIM}] {cons_markup}  "
-        f"[{TEXT_DIM}]{t('max_label')}[/{TEXT_DIM}] [{RED}]{snap['max_consecutive_losses']}[/{RED}]"
+    items.append(BLANK_LINE)
+    items.append(Text.assemble(
+        "  ", dim_label("consecutive"), " ", (str(cons), cons_style), "  ",
+        dim_label("max_label"), " ", (str(snap["max_consecutive_losses"]), RED),
     ))
 
-    items.append(Text(""))
+    items.append(BLANK_LINE)
     items.append(section_header(t("traffic"), inner_w))
-    traffic = Table(show_header=False, box=None, padding=(0, 1), width=width)
-    traffic.add_column("k", style=TEXT_DIM, width=max(11, width // 5), no_wrap=True)
-    traffic.add_column("v", width=max(10, width - max(11, width // 5) - 3), no_wrap=True)
-    traffic.add_row(f"{t('traffic_app')}:", _traffic_markup(snap.get("app_bytes_sent"), snap.get("app_bytes_recv")))
-    traffic.add_row(f"{t('traffic_system')}:", _traffic_markup(snap.get("system_bytes_sent"), snap.get("system_bytes_recv")))
+    traffic = kv_table(width, key_width=max(11, width // 5))
+    traffic.add_row(key_label("traffic_app"), _traffic_markup(snap["app_bytes_sent"], snap["app_bytes_recv"]))
+    traffic.add_row(key_label("traffic_system"), _traffic_markup(snap["system_bytes_sent"], snap["system_bytes_recv"]))
     items.append(traffic)
 
     return Panel(
@@ -2,55 +2,67 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from rich import box
 from rich.panel import Panel
 from rich.text import Text
 
 from ui.theme import ACCENT, BG, GREEN, RED, WHITE, YELLOW
-from ui.helpers import truncate
+from ui.helpers import t, truncate
 
 try:
-    from config import SHOW_VISUAL_ALERTS, t
+    from config import SHOW_VISUAL_ALERTS
 except ImportError:
-    from ...config import SHOW_VISUAL_ALERTS, t  # type: ignore[no-redef]
+    from ...config import SHOW_VISUAL_ALERTS  # type: ignore[no-redef]
 
 if TYPE_CHECKING:
     from stats_repository import StatsSnapshot
 
 
-ALERT_STYLES = {
+ALERT_STYLES: dict[str, dict[str, Any]] = {
     "critical": {"icon": "!", "bg": RED, "fg": WHITE, "priority": 0},
     "warning": {"icon": "^", "bg": YELLOW, "fg": BG, "priority": 1},
     "info": {"icon": "i", "bg": ACCENT, "fg": BG, "priority": 2},
     "success": {"icon": "+", "bg": GREEN, "fg": BG, "priority": 3},
 }
 
+# Per-type render parameters, precomputed once:
+# (priority, prefix, text style, counter style, border style, panel style).
+_ALERT_RENDER = {
+    kind: (
+        style["priority"], f" {style['icon']} ", f"bold {style['fg']}", style["fg"], style["bg"], f"on {style['bg']}",
+    )
+    for kind, style in ALERT_STYLES.items()
+}
+_ALERT_RENDER_DEFAULT = _ALERT_RENDER["info"]
+
 
 def render_toast(snap: StatsSnapshot, width: int) -> Panel | None:
     """Render an alert banner with restrained, premium styling."""
-    if not SHOW_VISUAL_ALERTS or not snap.get("active_alerts"):
+    alerts = snap["active_alerts"]
+    if not SHOW_VISUAL_ALERTS or not alerts:
         return None
 
-    alerts = sorted(
-        snap["active_alerts"],
-        key=lambda alert: ALERT_STYLES.get(alert.get("type", "info"), ALERT_STYLES["info"])["priority"],
+    primary = min(
+        alerts,
+        key=lambda alert: _ALERT_RENDER.get(alert.get("type", "info"), _ALERT_RENDER_DEFAULT)[0],
+    )
+    _, prefix, text_style, counter_style, border_style, panel_style = _ALERT_RENDER.get(
+        primary.get("type", "info"), _ALERT_RENDER_DEFAULT
     )
-    primary = alerts[0]
-    style = ALERT_STYLES.get(primary.get("type", "info"), ALERT_STYLES["info"])
 
     msg = truncate(primary.get("message", ""), max(20, width - 12))
-    text = Text(f" {style['icon']} {msg} ", style=f"bold {style['fg']}")
+    text = Text(prefix + msg + " ", style=text_style)
     if len(alerts) > 1:
         text.append(" ")
-        text.append(f"+{len(alerts) - 1} {t('more_alerts')}", style=style["fg"])
+        text.append(f"+{len(alerts) - 1} {t('more_alerts')}", style=counter_style)
 
     return Panel(
         text,
-        border_style=style["bg"],
+        border_style=border_style,
         box=box.ROUNDED,
         width=width,
-        style=f"on {style['bg']}",
+        style=panel_style,
         padding=(0, 1),
     )
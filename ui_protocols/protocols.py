@@ -41,6 +41,9 @@ class StatsDataProvider(Protocol):
             - route analysis data
             - active alerts
             - etc.
+
+            Its ``version`` changes whenever any other field may have changed,
+            so equal versions let the UI reuse the previous frame.
         """
         ...
     